@@ -0,0 +1,228 @@
+"""
+Offline benchmark for the site scrapers.
+
+Each scraper runs in its own child process against a local FixtureServer,
+so CPU time and peak RSS belong to the scraper alone. Example:
+
+    python bench/run.py --latency 0.05 --jitter 0.02
+    python bench/run.py --save-baseline
+    python bench/run.py --compare
+"""
+import argparse
+import asyncio
+import contextlib
+import functools
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from server import FixtureServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+SCRAPERS = ("nykaa", "zepto")
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, int(round(pct / 100 * len(values))) - 1))
+    return values[index]
+
+
+def run_nykaa(url, workers):
+    sys.path.insert(0, os.path.join(ROOT, "nykaa"))
+    from app import NykaaScraper
+
+    latencies = []
+    scraper = NykaaScraper(
+        max_workers=workers,
+        cache_dir=None,
+        checkpoint_file=None,
+        home_url=url,
+        base_url=url.rstrip("/")
+    )
+
+    download = scraper.fetcher._download
+
+    def timed_download(page_url):
+        start = time.perf_counter()
+        try:
+            return download(page_url)
+        finally:
+            latencies.append(time.perf_counter() - start)
+
+    scraper.fetcher._download = timed_download
+    scraper.main()
+    return latencies
+
+
+def run_zepto(url, workers):
+    sys.path.insert(0, os.path.join(ROOT, "zeptonow"))
+    import app as zepto
+
+    latencies = []
+    fetch = zepto.fetch
+
+    @functools.wraps(fetch)
+    async def timed_fetch(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await fetch(*args, **kwargs)
+        finally:
+            latencies.append(time.perf_counter() - start)
+
+    zepto.fetch = timed_fetch
+    # The fixture server needs no politeness limit
+    asyncio.run(zepto.main(
+        concurrency=workers,
+        requests_per_second=1e6,
+        burst=1e6,
+        cache_dir=None,
+        base_url=url,
+        start_url=url
+    ))
+    return latencies
+
+
+def cpu_seconds():
+    """
+    :return: User + system CPU time of this process and its reaped children
+    """
+    usage = [resource.getrusage(who) for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN)]
+    return sum(u.ru_utime + u.ru_stime for u in usage)
+
+
+def child(site, url, workers):
+    """
+    Run one scraper in this process and print its measurements as JSON.
+    """
+    runner = {"nykaa": run_nykaa, "zepto": run_zepto}[site]
+    workdir = tempfile.mkdtemp(prefix=f"bench-{site}-")
+    os.chdir(workdir)
+
+    # Nykaa parses in a process pool, so child processes count towards CPU and memory
+    cpu_start = cpu_seconds()
+    wall_start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        latencies = runner(url, workers)
+    wall = time.perf_counter() - wall_start
+    cpu = cpu_seconds() - cpu_start
+
+    print(json.dumps({
+        "pages": len(latencies),
+        "wall_s": wall,
+        "pages_per_s": len(latencies) / wall if wall else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "cpu_s": cpu,
+        # ru_maxrss is KiB on Linux; for children it is the largest reaped child
+        "peak_rss_mb": (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                        + resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss) / 1024,
+    }))
+
+
+def measure(site, args):
+    with FixtureServer(site, latency=args.latency, jitter=args.jitter) as server:
+        result = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", site,
+             "--url", server.url, "--workers", str(args.workers)],
+            capture_output=True,
+            text=True
+        )
+    if result.returncode != 0:
+        raise RuntimeError(f"{site} benchmark failed:\n{result.stderr}")
+    stats = json.loads(result.stdout.strip().splitlines()[-1])
+    stats["server_requests"] = server.requests
+    return stats
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True
+        ).stdout.strip()
+    except OSError:
+        return ""
+
+
+def baseline_path(site):
+    return os.path.join(BASELINE_DIR, f"{site}.json")
+
+
+def compare(site, stats, threshold):
+    """
+    Print the change against the saved baseline.
+
+    :return: True if throughput dropped or p95 latency/CPU grew by more than ``threshold``
+    """
+    try:
+        with open(baseline_path(site)) as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        print(f"  no baseline for {site}")
+        return False
+
+    regressed = False
+    print(f"  vs baseline {baseline.get('commit', '?')}:")
+    for key, higher_is_better in (("pages_per_s", True), ("p95_ms", False), ("cpu_s", False), ("peak_rss_mb", False)):
+        old, new = baseline["stats"][key], stats[key]
+        change = (new - old) / old if old else 0.0
+        worse = -change if higher_is_better else change
+        flag = ""
+        if worse > threshold:
+            flag = "  REGRESSION"
+            regressed = True
+        print(f"    {key:12s} {old:10.2f} -> {new:10.2f} ({change:+.1%}){flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scrapers", default=",".join(SCRAPERS), help="Comma-separated scrapers to run")
+    parser.add_argument("--latency", type=float, default=0.05, help="Mean injected latency per page (s)")
+    parser.add_argument("--jitter", type=float, default=0.02, help="Latency jitter (+/- s)")
+    parser.add_argument("--workers", type=int, default=5, help="Scraper concurrency")
+    parser.add_argument("--save-baseline", action="store_true", help="Store results as the new baselines")
+    parser.add_argument("--compare", action="store_true", help="Compare against the saved baselines")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative change counted as a regression")
+    parser.add_argument("--child", choices=SCRAPERS, help=argparse.SUPPRESS)
+    parser.add_argument("--url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.url, args.workers)
+        return
+
+    regressed = False
+    for site in args.scrapers.split(","):
+        stats = measure(site, args)
+        print(f"{site}: {stats['pages']} pages in {stats['wall_s']:.2f}s "
+              f"({stats['pages_per_s']:.1f} pages/s), p50 {stats['p50_ms']:.1f}ms, "
+              f"p95 {stats['p95_ms']:.1f}ms, cpu {stats['cpu_s']:.2f}s, peak RSS {stats['peak_rss_mb']:.1f}MB")
+
+        if args.compare:
+            regressed = compare(site, stats, args.threshold) or regressed
+        if args.save_baseline:
+            os.makedirs(BASELINE_DIR, exist_ok=True)
+            with open(baseline_path(site), "w") as f:
+                json.dump({
+                    "commit": git_commit(),
+                    "latency": args.latency,
+                    "jitter": args.jitter,
+                    "workers": args.workers,
+                    "stats": stats,
+                }, f, indent=2)
+            print(f"  saved baseline to {baseline_path(site)}")
+
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == "__main__":
+    main()
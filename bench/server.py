@@ -0,0 +1,118 @@
+import hashlib
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# URL path patterns -> recorded fixture, per site
+ROUTES = {
+    "nykaa": [
+        (re.compile(r"^/$"), "nykaa_home.html"),
+        (re.compile(r"/c/\d+$"), "nykaa_listing.html"),
+        (re.compile(r"/p/\d+$"), "nykaa_product.html"),
+    ],
+    "zepto": [
+        (re.compile(r"^/$"), "zepto_home.html"),
+        (re.compile(r"/cid/\d+$"), "zepto_category.html"),
+    ],
+}
+
+
+class FixtureServer:
+    def __init__(self, site, latency=0.05, jitter=0.02, host="127.0.0.1", port=0):
+        """
+        Local stand-in for a live site: replays recorded fixtures over HTTP/1.1
+        keep-alive with an injected per-request latency.
+
+        :param site: Key into ROUTES ("nykaa" or "zepto")
+        :param latency: Mean seconds added to every response
+        :param jitter: Uniform +/- seconds around ``latency``
+        :param host: Interface to bind
+        :param port: Port to bind (0 picks a free one)
+        """
+        self.site = site
+        self.latency = latency
+        self.jitter = jitter
+        self.requests = 0
+        self._lock = threading.Lock()
+
+        self.pages = {}
+        for _, name in ROUTES[site]:
+            with open(os.path.join(FIXTURES_DIR, name), "rb") as f:
+                body = f.read()
+            self.pages[name] = (body, '"%s"' % hashlib.sha1(body).hexdigest())
+
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def _route(self, path):
+        path = path.split("?", 1)[0]
+        for pattern, name in ROUTES[self.site]:
+            if pattern.search(path):
+                return self.pages[name]
+        return None
+
+    def _delay(self):
+        return max(0.0, self.latency + random.uniform(-self.jitter, self.jitter))
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests += 1
+                time.sleep(server._delay())
+
+                page = server._route(self.path)
+                if page is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                body, etag = page
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1 @@
+# Helpers shared by the site scrapers (nykaa/, zeptonow/).
@@ -0,0 +1,77 @@
+import soupsieve
+
+from common.html_parser import FastNode
+
+
+class Field:
+    def __init__(self, selector=None, attr=None, text="text", post=None, default="", find=None):
+        """
+        One output field of an extraction spec.
+
+        :param selector: CSS selector relative to the node (None means the node itself)
+        :param attr: Read this attribute instead of the text
+        :param text: How to read text: "text" (.text.strip()), "strip" (get_text(strip=True))
+                     or "spaced" (get_text(separator=" ").strip())
+        :param post: Optional callable applied to the extracted string
+        :param default: Value used when nothing matches
+        :param find: find() keyword arguments, for lookups CSS can't express (e.g. string=...)
+        """
+        if text not in ("text", "strip", "spaced"):
+            raise ValueError(f"Unknown text mode: {text}")
+        self.selector = selector
+        self.attr = attr
+        self.text = text
+        self.post = post
+        self.default = default
+        self.find = find
+        self.compiled = soupsieve.compile(selector) if selector else None
+
+    def locate(self, node):
+        if self.find is not None:
+            return node.find(**self.find)
+        if self.selector is None:
+            return node
+        if isinstance(node, FastNode):
+            return node.select_one(self.selector)
+        return self.compiled.select_one(node)
+
+    def read(self, element):
+        if self.attr:
+            value = element.get(self.attr, self.default)
+        elif self.text == "strip":
+            value = element.get_text(strip=True)
+        elif self.text == "spaced":
+            value = element.get_text(separator=" ").strip()
+        else:
+            value = element.text.strip()
+        return self.post(value) if self.post else value
+
+
+class Spec:
+    def __init__(self, fields, derived=None):
+        """
+        Declarative extraction spec: maps output names to Fields. Selectors
+        are compiled once, and each one runs a single time per node.
+
+        :param fields: {name: Field}
+        :param derived: Optional {name: callable(record) -> value} computed after the fields
+        """
+        self.fields = list(fields.items())
+        self.derived = list((derived or {}).items())
+
+    def extract(self, node):
+        """
+        Apply the spec to one node (a card or a whole page).
+
+        :return: {name: value}
+        """
+        record = {}
+        for name, field in self.fields:
+            element = field.locate(node)
+            record[name] = field.read(element) if element is not None else field.default
+        for name, compute in self.derived:
+            record[name] = compute(record)
+        return record
+
+    def extract_all(self, nodes):
+        return [self.extract(node) for node in nodes]
@@ -0,0 +1,210 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+
+def worker_id():
+    """
+    :return: Identifier for this process/thread, recorded on leases for debugging
+    """
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+
+class Frontier:
+    def __init__(self, path="frontier.sqlite3", visibility_timeout=600, max_attempts=3):
+        """
+        Shared crawl frontier backed by SQLite, so several worker processes
+        (or machines sharing the file) can split one crawl.
+
+        Each task is unique per (queue, key), so seeding the same URL twice is
+        a no-op. A worker leases tasks; a leased task is invisible to other
+        workers until it is acked, released, or its lease outlives
+        ``visibility_timeout`` (the worker is presumed dead and the task is
+        handed out again). Workers extend the leases of tasks they are still
+        working on, so only a dead worker's tasks expire. Tasks leased
+        ``max_attempts`` times are given up on.
+
+        Done tasks stay done, so a queue describes one crawl: name queues per
+        crawl (e.g. "nykaa:product_types:2024-06-01") to crawl again.
+
+        :param path: SQLite database file
+        :param visibility_timeout: Seconds a lease stays valid without an ack
+        :param max_attempts: Leases allowed per task
+        """
+        self.path = path
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS tasks (
+                queue TEXT NOT NULL,
+                key TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                state TEXT NOT NULL DEFAULT 'pending',
+                lease_expires REAL NOT NULL DEFAULT 0,
+                worker TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (queue, key)
+            )
+            """
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS tasks_state ON tasks (queue, state, lease_expires)")
+
+    def add(self, queue, tasks):
+        """
+        Seed tasks; keys already in the queue (in any state) are ignored.
+
+        :param queue: Queue name, e.g. "nykaa:product_types"
+        :param tasks: Iterable of (key, payload) where payload is JSON-serialisable
+        :return: Number of new tasks
+        """
+        rows = [(queue, key, json.dumps(payload)) for key, payload in tasks]
+        with self._lock:
+            before = self._db.total_changes
+            self._db.execute("BEGIN IMMEDIATE")
+            self._db.executemany("INSERT OR IGNORE INTO tasks (queue, key, payload) VALUES (?, ?, ?)", rows)
+            self._db.execute("COMMIT")
+            return self._db.total_changes - before
+
+    def lease(self, queue, worker=None, limit=1):
+        """
+        Atomically lease up to ``limit`` tasks that are pending or whose lease expired.
+
+        :return: List of (key, payload)
+        """
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._db.execute(
+                    """
+                    SELECT key, payload FROM tasks
+                    WHERE queue = ? AND attempts < ?
+                      AND (state = 'pending' OR (state = 'leased' AND lease_expires < ?))
+                    LIMIT ?
+                    """,
+                    (queue, self.max_attempts, now, limit)
+                ).fetchall()
+                self._db.executemany(
+                    """
+                    UPDATE tasks SET state = 'leased', lease_expires = ?, worker = ?, attempts = attempts + 1
+                    WHERE queue = ? AND key = ?
+                    """,
+                    [(now + self.visibility_timeout, worker or worker_id(), queue, key) for key, _ in rows]
+                )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        return [(key, json.loads(payload)) for key, payload in rows]
+
+    def extend(self, queue, key, worker=None):
+        """
+        Renew a lease for another ``visibility_timeout`` seconds.
+
+        :return: False if the task is no longer leased to ``worker``
+        """
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE tasks SET lease_expires = ? WHERE queue = ? AND key = ? AND state = 'leased' AND worker = ?",
+                (time.time() + self.visibility_timeout, queue, key, worker or worker_id())
+            )
+            return cursor.rowcount > 0
+
+    def ack(self, queue, key):
+        """
+        Mark a leased task as done.
+        """
+        with self._lock:
+            self._db.execute("UPDATE tasks SET state = 'done' WHERE queue = ? AND key = ?", (queue, key))
+
+    def release(self, queue, key):
+        """
+        Give a leased task back so another worker can retry it right away.
+        """
+        with self._lock:
+            self._db.execute(
+                "UPDATE tasks SET state = 'pending', lease_expires = 0 WHERE queue = ? AND key = ? AND state = 'leased'",
+                (queue, key)
+            )
+
+    def outstanding(self, queue):
+        """
+        :return: Tasks not yet done that can still be attempted (pending or leased)
+        """
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM tasks WHERE queue = ? AND state != 'done' AND "
+                "(attempts < ? OR (state = 'leased' AND lease_expires >= ?))",
+                (queue, self.max_attempts, time.time())
+            ).fetchone()[0]
+
+    def given_up(self, queue):
+        """
+        :return: Tasks that used up their ``max_attempts`` without being done
+        """
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM tasks WHERE queue = ? AND state != 'done' AND attempts >= ? AND "
+                "NOT (state = 'leased' AND lease_expires >= ?)",
+                (queue, self.max_attempts, time.time())
+            ).fetchone()[0]
+
+    def finished(self, queue):
+        """
+        :return: True if the queue has tasks and none of them is left to do
+        """
+        with self._lock:
+            seeded = self._db.execute("SELECT 1 FROM tasks WHERE queue = ? LIMIT 1", (queue,)).fetchone()
+        return seeded is not None and not self.outstanding(queue)
+
+    def _heartbeat(self, queue, key, worker, stop):
+        # Renew the lease a few times per timeout until the task is handled
+        while not stop.wait(self.visibility_timeout / 3):
+            self.extend(queue, key, worker)
+
+    def drain(self, queue, handle, poll_interval=1.0, worker=None):
+        """
+        Lease and process tasks one at a time until the queue has nothing
+        left to do. The lease is extended while ``handle`` runs, however long
+        it takes. Tasks leased by other workers are waited on, so an expired
+        lease is picked up here if its worker died.
+
+        :param handle: Callable(key, payload); an exception releases the task for retry
+        :return: Number of tasks this worker completed
+        """
+        worker = worker or worker_id()
+        completed = 0
+        while True:
+            leased = self.lease(queue, worker)
+            if not leased:
+                if not self.outstanding(queue):
+                    return completed
+                time.sleep(poll_interval)
+                continue
+
+            key, payload = leased[0]
+            stop = threading.Event()
+            heartbeat = threading.Thread(target=self._heartbeat, args=(queue, key, worker, stop), daemon=True)
+            heartbeat.start()
+            try:
+                handle(key, payload)
+            except Exception as e:
+                print(f"Task {key} failed, releasing it: {e}")
+                self.release(queue, key)
+                continue
+            finally:
+                stop.set()
+                heartbeat.join()
+            self.ack(queue, key)
+            completed += 1
+
+    def close(self):
+        with self._lock:
+            self._db.close()
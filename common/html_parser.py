@@ -0,0 +1,133 @@
+import os
+import re
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser
+    except ImportError:
+        HTMLParser = None
+
+BACKENDS = ("html.parser", "lxml", "selectolax")
+
+# Backend used when callers don't pick one; override with SCRAPER_HTML_PARSER
+DEFAULT_BACKEND = os.getenv("SCRAPER_HTML_PARSER", "html.parser")
+
+
+class Only:
+    """
+    Partial-parsing filter: keep only the subtrees rooted at tags that
+    match ``name`` and ``attrs`` (an attrs value of True means "present").
+    """
+
+    def __init__(self, name=None, attrs=None):
+        self.name = name
+        self.attrs = attrs or {}
+
+    def strainer(self):
+        attrs = dict(self.attrs)
+        if isinstance(attrs.get("class"), str):
+            # Match one class out of a multi-valued class attribute
+            attrs["class"] = re.compile(r"(^|\s)%s(\s|$)" % re.escape(attrs["class"]))
+        return SoupStrainer(self.name, attrs=attrs)
+
+    def css(self):
+        selector = self.name or ""
+        for key, value in self.attrs.items():
+            if key == "class" and value is not True:
+                selector += f".{value}"
+            elif value is True:
+                selector += f"[{key}]"
+            else:
+                selector += f'[{key}="{value}"]'
+        return selector or "*"
+
+
+def _css_for(name, attrs):
+    return Only(name, attrs).css()
+
+
+class FastNode:
+    """
+    BeautifulSoup-compatible view over a selectolax node, covering the
+    subset of the Tag API the scrapers use: select, select_one, find,
+    find_all, find_next_sibling, get, text and get_text.
+    """
+
+    __slots__ = ("node",)
+
+    def __init__(self, node):
+        self.node = node
+
+    def select(self, selector):
+        return [FastNode(n) for n in self.node.css(selector)]
+
+    def select_one(self, selector):
+        node = self.node.css_first(selector)
+        return FastNode(node) if node is not None else None
+
+    def find_all(self, name=None, attrs=None, string=None):
+        nodes = self.select(_css_for(name, attrs))
+        if string is not None:
+            nodes = [n for n in nodes if n._matches_string(string)]
+        return nodes
+
+    def find(self, name=None, attrs=None, string=None):
+        if string is None:
+            return self.select_one(_css_for(name, attrs))
+        matches = self.find_all(name, attrs, string)
+        return matches[0] if matches else None
+
+    def find_next_sibling(self, name=None):
+        node = self.node.next
+        while node is not None:
+            if node.tag != "-text" and (name is None or node.tag == name):
+                return FastNode(node)
+            node = node.next
+        return None
+
+    def _matches_string(self, string):
+        # Mirrors Tag.string: only tags whose content is a single text node have one
+        children = list(self.node.iter(include_text=True))
+        if len(children) != 1 or children[0].tag != "-text":
+            return False
+        value = children[0].text(deep=False)
+        return string(value) if callable(string) else value == string
+
+    def get(self, key, default=None):
+        value = self.node.attributes.get(key)
+        return default if value is None else value
+
+    @property
+    def text(self):
+        return self.node.text(deep=True)
+
+    def get_text(self, separator="", strip=False):
+        return self.node.text(deep=True, separator=separator, strip=strip)
+
+
+def parse(markup, backend=None, only=None):
+    """
+    Parse HTML with the chosen backend.
+
+    ``html.parser`` and ``lxml`` return a BeautifulSoup; with ``only`` set,
+    they build just the matching subtrees. ``selectolax`` returns a FastNode
+    for the document (it parses everything, but much faster).
+
+    :param markup: HTML as str or bytes
+    :param backend: One of BACKENDS (defaults to DEFAULT_BACKEND)
+    :param only: Optional Only filter for partial parsing
+    :return: BeautifulSoup or FastNode
+    """
+    backend = backend or DEFAULT_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown HTML parser backend: {backend}")
+
+    if backend == "selectolax":
+        if HTMLParser is None:
+            raise ImportError("selectolax is required for the selectolax backend (pip install selectolax)")
+        return FastNode(HTMLParser(markup).root)
+
+    return BeautifulSoup(markup, backend, parse_only=only.strainer() if only else None)
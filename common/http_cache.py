@@ -0,0 +1,170 @@
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+
+class HttpCache:
+    def __init__(self, directory="http_cache", ttl=7 * 24 * 3600, max_bytes=500 * 1024 * 1024):
+        """
+        Persistent on-disk response cache for conditional GETs.
+
+        Bodies are stored as files and their ETag/Last-Modified validators
+        in a SQLite index. Callers send the headers from conditional_headers()
+        and, on a 304, serve the stored body via revalidated(). Entries older
+        than ``ttl`` are dropped, and the least recently used entries are
+        evicted once the cache grows past ``max_bytes``.
+
+        :param directory: Cache directory (created if missing)
+        :param ttl: Seconds an entry may be kept since it was last stored
+        :param max_bytes: Total body size kept on disk
+        """
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.join(directory, "bodies"), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(directory, "index.sqlite3"), check_same_thread=False)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+            """
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)")
+        self._db.commit()
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(url):
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _body_path(self, key):
+        return os.path.join(self.directory, "bodies", key)
+
+    def _delete(self, key):
+        self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+        try:
+            os.remove(self._body_path(key))
+        except FileNotFoundError:
+            pass
+
+    def conditional_headers(self, url):
+        """
+        :param url: URL about to be fetched
+        :return: If-None-Match / If-Modified-Since headers for a cached entry, else {}
+        """
+        key = self._key(url)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, last_modified, stored_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return {}
+            etag, last_modified, stored_at = row
+            if time.time() - stored_at > self.ttl or not os.path.exists(self._body_path(key)):
+                self._delete(key)
+                self._db.commit()
+                return {}
+
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def revalidated(self, url):
+        """
+        Return the stored body after the server answered 304 Not Modified.
+
+        :param url: URL that was revalidated
+        :return: Cached body bytes, or None if the entry has disappeared
+        """
+        key = self._key(url)
+        try:
+            with open(self._body_path(key), "rb") as f:
+                body = f.read()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        with self._lock:
+            self._db.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+        self.hits += 1
+        return body
+
+    def store(self, url, body, headers):
+        """
+        Cache a 200 response if it carries a validator.
+
+        :param url: Fetched URL
+        :param body: Response body bytes
+        :param headers: Response headers (case-insensitive mapping)
+        """
+        self.misses += 1
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+        if len(body) > self.max_bytes:
+            return
+
+        key = self._key(url)
+        body_path = self._body_path(key)
+        # A temp file per writer: threads storing the same URL each replace the body whole
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(body_path), prefix=key, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(body)
+            os.replace(tmp_path, body_path)
+        except Exception:
+            os.remove(tmp_path)
+            raise
+
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, url, etag, last_modified, now, now, len(body))
+            )
+            self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        """
+        Drop expired entries, then least recently used ones until under max_bytes.
+        Must be called with the lock held.
+        """
+        expired = self._db.execute(
+            "SELECT key FROM entries WHERE stored_at < ?", (time.time() - self.ttl,)
+        ).fetchall()
+        for (key,) in expired:
+            self._delete(key)
+
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._db.execute(
+            "SELECT key, size FROM entries ORDER BY accessed_at"
+        ).fetchall():
+            self._delete(key)
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def close(self):
+        with self._lock:
+            self._db.close()
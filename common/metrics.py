@@ -0,0 +1,231 @@
+import json
+import threading
+from bisect import bisect_left
+from threading import get_ident
+
+# Series recorded by the scrapers: seconds per stage (fetch, wait, parse,
+# extract, write) and pages fetched per source, both labeled by page kind
+STAGE_SECONDS = "scraper_stage_seconds"
+PAGES_TOTAL = "scraper_pages_total"
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is +Inf
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _prometheus_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (
+        (name, str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'))
+        for name, value in pairs
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+class Counter:
+    """
+    Monotonic counter. Each thread adds into its own shard, so ``inc`` never
+    takes a lock; shards are summed when the value is read.
+    """
+    __slots__ = ("_shards",)
+
+    def __init__(self):
+        self._shards = {}
+
+    def inc(self, amount=1):
+        shard = self._shards.get(get_ident())
+        if shard is None:
+            shard = self._shards.setdefault(get_ident(), [0])
+        shard[0] += amount
+
+    @property
+    def value(self):
+        return sum(shard[0] for shard in list(self._shards.values()))
+
+
+class Histogram:
+    """
+    Latency histogram with fixed buckets, sharded per thread like Counter.
+    Time a stage with ``start = time.perf_counter()`` ...
+    ``histogram.observe(time.perf_counter() - start)``.
+    """
+    __slots__ = ("buckets", "_shards")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._shards = {}
+
+    def observe(self, value):
+        shard = self._shards.get(get_ident())
+        if shard is None:
+            # Bucket counts, then sum and max
+            shard = self._shards.setdefault(get_ident(), [0] * (len(self.buckets) + 1) + [0.0, 0.0])
+        shard[bisect_left(self.buckets, value)] += 1
+        shard[-2] += value
+        if value > shard[-1]:
+            shard[-1] = value
+
+    def snapshot(self):
+        """
+        :return: (bucket counts, sum, count, max) merged over all threads
+        """
+        counts = [0] * (len(self.buckets) + 1)
+        total = 0.0
+        maximum = 0.0
+        for shard in list(self._shards.values()):
+            for index in range(len(counts)):
+                counts[index] += shard[index]
+            total += shard[-2]
+            maximum = max(maximum, shard[-1])
+        return counts, total, sum(counts), maximum
+
+    def quantile(self, q, snapshot=None):
+        """
+        :return: Upper bound of the bucket holding quantile ``q`` (the max for the +Inf bucket)
+        """
+        counts, _, count, maximum = snapshot or self.snapshot()
+        if not count:
+            return 0.0
+        seen = 0
+        for index, bucket_count in enumerate(counts):
+            seen += bucket_count
+            if seen >= q * count:
+                return self.buckets[index] if index < len(self.buckets) else maximum
+        return maximum
+
+
+class Metrics:
+    def __init__(self, **labels):
+        """
+        In-process counters and latency histograms for a scraping run,
+        exported at the end as a JSON summary and a Prometheus text file.
+
+        Look instruments up once and keep them, e.g.
+        ``fetch = metrics.histogram("stage_seconds", stage="fetch", kind="detail")``;
+        the returned object is shared by every caller with the same name and
+        labels, and ``fetch.observe(s)`` / ``counter.inc()`` take no lock, so
+        they stay well under a microsecond.
+
+        :param labels: Labels added to every series, e.g. site="nykaa"
+        """
+        self.labels = labels
+        self._counters = {}
+        self._histograms = {}
+        self._stages = {}
+        self._pages = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name, **labels):
+        key = (name, _label_key(dict(self.labels, **labels)))
+        counter = self._counters.get(key)
+        if counter is None:
+            with self._lock:
+                counter = self._counters.setdefault(key, Counter())
+        return counter
+
+    def histogram(self, name, buckets=DEFAULT_BUCKETS, **labels):
+        key = (name, _label_key(dict(self.labels, **labels)))
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, Histogram(buckets))
+        return histogram
+
+    def stage(self, kind, stage):
+        """
+        :return: The STAGE_SECONDS histogram for one page kind and stage
+        """
+        histogram = self._stages.get((kind, stage))
+        if histogram is None:
+            histogram = self._stages.setdefault((kind, stage), self.histogram(STAGE_SECONDS, kind=kind, stage=stage))
+        return histogram
+
+    def pages(self, kind, source):
+        """
+        :return: The PAGES_TOTAL counter for one page kind and source (http, browser, failed, ...)
+        """
+        counter = self._pages.get((kind, source))
+        if counter is None:
+            counter = self._pages.setdefault((kind, source), self.counter(PAGES_TOTAL, kind=kind, source=source))
+        return counter
+
+    def summary(self):
+        """
+        :return: {"counters": [...], "histograms": [...]}, one entry per series
+        """
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(self._histograms.items())
+        return {
+            "counters": [
+                {"name": name, "labels": dict(labels), "value": counter.value}
+                for (name, labels), counter in counters
+            ],
+            "histograms": [
+                self._histogram_summary(name, labels, histogram)
+                for (name, labels), histogram in histograms
+            ],
+        }
+
+    @staticmethod
+    def _histogram_summary(name, labels, histogram):
+        snapshot = histogram.snapshot()
+        _, total, count, maximum = snapshot
+        return {
+            "name": name,
+            "labels": dict(labels),
+            "count": count,
+            "sum": round(total, 6),
+            "mean": round(total / count, 6) if count else 0.0,
+            "p50": histogram.quantile(0.5, snapshot),
+            "p95": histogram.quantile(0.95, snapshot),
+            "max": round(maximum, 6),
+        }
+
+    def prometheus(self):
+        """
+        :return: All series in the Prometheus text exposition format
+        """
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(self._histograms.items())
+
+        lines = []
+        typed = set()
+        for (name, labels), counter in counters:
+            if name not in typed:
+                lines.append(f"# TYPE {name} counter")
+                typed.add(name)
+            lines.append(f"{name}{_prometheus_labels(labels)} {counter.value}")
+        for (name, labels), histogram in histograms:
+            if name not in typed:
+                lines.append(f"# TYPE {name} histogram")
+                typed.add(name)
+            counts, total, count, _ = histogram.snapshot()
+            cumulative = 0
+            for bound, bucket_count in zip(list(histogram.buckets) + ["+Inf"], counts):
+                cumulative += bucket_count
+                lines.append(f"{name}_bucket{_prometheus_labels(labels, [('le', bound)])} {cumulative}")
+            lines.append(f"{name}_sum{_prometheus_labels(labels)} {total}")
+            lines.append(f"{name}_count{_prometheus_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, prefix):
+        """
+        Write ``<prefix>.json`` and ``<prefix>.prom``.
+        """
+        with open(f"{prefix}.json", "w") as f:
+            json.dump(self.summary(), f, indent=2)
+        with open(f"{prefix}.prom", "w") as f:
+            f.write(self.prometheus())
+
+    def print_summary(self):
+        for series in self.summary()["histograms"]:
+            labels = ",".join(f"{name}={value}" for name, value in series["labels"].items())
+            print(f"{series['name']}{{{labels}}}: n={series['count']} total={series['sum']:.2f}s "
+                  f"p50<={series['p50']}s p95<={series['p95']}s max={series['max']:.3f}s")
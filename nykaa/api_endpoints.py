@@ -0,0 +1,439 @@
+import base64
+import json
+import os
+import re
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+import requests
+from bs4 import BeautifulSoup
+
+# Query parameters that select a page of results, and those that count items instead of pages
+PAGE_PARAMS = ("page_no", "pageNo", "page", "currentPage", "pageNumber", "offset", "from", "start")
+OFFSET_PARAMS = ("offset", "from", "start")
+
+# Keys holding the total number of results next to a listing's product array
+TOTAL_KEYS = ("total", "totalFound", "total_found", "totalCount", "total_count", "count")
+
+# Candidate JSON keys for each of our output fields, most specific first
+LISTING_FIELDS = {
+    "product_name": ("name", "title", "productName", "product_name"),
+    "brand": ("brandName", "brand_name", "brand"),
+    "price": ("offerPrice", "offer_price", "finalPrice", "final_price", "price", "mrp"),
+    "discount": ("discount", "discountPercent", "discount_percent", "discountText"),
+    "product_link": ("actionUrl", "action_url", "productUrl", "url", "slug"),
+}
+DETAIL_FIELDS = {
+    "rating": ("rating", "avgRating", "averageRating", "avg_rating"),
+    "num_ratings": ("ratingCount", "rating_count", "totalRatings", "reviewCount"),
+    "description": ("description", "productDescription", "shortDescription", "long_description"),
+}
+
+# Stands in for the page id while a template URL is urlencoded
+_ID_SENTINEL = "__NYKAA_ID__"
+
+
+def page_id(url):
+    """
+    Numeric id of a listing or product page, e.g. ``249`` for
+    ``/makeup/lips/lipstick/c/249`` or ``123`` for ``/brand/p/123``.
+
+    :param url: Absolute or relative page URL
+    :return: Id string, or None if the URL has none
+    """
+    parsed = urlparse(url)
+    for key, value in parse_qsl(parsed.query):
+        if key in ("productId", "categoryId") and value.isdigit():
+            return value
+    digits = [segment for segment in parsed.path.split("/") if re.fullmatch(r"\d+", segment)]
+    return digits[-1] if digits else None
+
+
+def dig(data, path):
+    """
+    Follow a list of keys/indices into decoded JSON.
+
+    :return: The value found, or None if the path doesn't exist
+    """
+    for key in path:
+        try:
+            data = data[key]
+        except (KeyError, IndexError, TypeError):
+            return None
+    return data
+
+
+def performance_events(driver):
+    """
+    Drain the browser's performance log.
+
+    :param driver: Chrome WebDriver started with the "goog:loggingPrefs" performance capability
+    :return: List of DevTools event dicts ({"method", "params"})
+    """
+    return [json.loads(entry["message"])["message"] for entry in driver.get_log("performance")]
+
+
+def json_responses(driver, events):
+    """
+    Bodies of the JSON XHR/fetch GET responses found in ``events``.
+    Must be called before the driver navigates away, while the bodies are
+    still held by DevTools.
+
+    :param driver: Chrome WebDriver with the Network domain enabled
+    :param events: Events from performance_events
+    :return: List of (request URL, decoded JSON)
+    """
+    methods = {}
+    responses = []
+    for event in events:
+        params = event.get("params", {})
+        if event.get("method") == "Network.requestWillBeSent":
+            methods[params["requestId"]] = params["request"]["method"]
+        elif event.get("method") == "Network.responseReceived":
+            response = params["response"]
+            if params.get("type") not in ("XHR", "Fetch") or "json" not in response.get("mimeType", ""):
+                continue
+            # POST bodies aren't in the log, so only GETs can be replayed
+            if methods.get(params["requestId"], "GET") != "GET":
+                continue
+            try:
+                body = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": params["requestId"]})
+                text = body["body"]
+                if body.get("base64Encoded"):
+                    text = base64.b64decode(text).decode("utf-8")
+                responses.append((response["url"], json.loads(text)))
+            except Exception:
+                # Evicted from the DevTools buffer, or not valid JSON after all
+                continue
+    return responses
+
+
+def _record_lists(data, path=()):
+    # Yield (path, list) for every list of objects, without descending into
+    # the objects themselves (their nested lists are variants, offers, ...)
+    if isinstance(data, dict):
+        for key, value in data.items():
+            yield from _record_lists(value, path + (key,))
+    elif isinstance(data, list) and data:
+        if all(isinstance(item, dict) for item in data):
+            yield path, data
+        else:
+            yield from _record_lists(data[0], path + (0,))
+
+
+def _objects(data, path=()):
+    # Yield (path, dict) for every object in the document
+    if isinstance(data, dict):
+        yield path, data
+        for key, value in data.items():
+            yield from _objects(value, path + (key,))
+    elif isinstance(data, list):
+        for i, item in enumerate(data):
+            yield from _objects(item, path + (i,))
+
+
+def _field_map(records, candidates):
+    # Our field -> the first candidate key present in any record
+    keys = set().union(*(record.keys() for record in records))
+    fields = {}
+    for field, names in candidates.items():
+        for name in names:
+            if name in keys:
+                fields[field] = name
+                break
+    return fields
+
+
+def _template_url(url, id_value):
+    """
+    :return: (URL with "{id}" in place of ``id_value``, page parameter, its observed value), or None
+        if the id isn't part of the URL
+    """
+    parsed = urlparse(url)
+    query = []
+    page_param = page_value = None
+    for key, value in parse_qsl(parsed.query, keep_blank_values=True):
+        if key in PAGE_PARAMS and value.isdigit() and page_param is None:
+            page_param, page_value = key, int(value)
+            continue
+        query.append((key, _ID_SENTINEL if value == id_value else value))
+    path = "/".join(_ID_SENTINEL if segment == id_value else segment for segment in parsed.path.split("/"))
+    url = urlunparse(parsed._replace(path=path, query=urlencode(query)))
+    if _ID_SENTINEL not in url:
+        return None
+    return url.replace(_ID_SENTINEL, "{id}"), page_param, page_value
+
+
+class ApiTemplates:
+    def __init__(self, path="nykaa_api_templates.json"):
+        """
+        URL templates and field mappings for the JSON endpoints behind
+        Nykaa's listing and detail pages, learned in discovery mode and
+        persisted as JSON so later runs (and people) can reuse and edit them.
+
+        A template looks like::
+
+            {"url": "https://.../api?category_id={id}&sort=popularity",
+             "page_param": "page_no", "first_page": 1, "offset": false,
+             "records_path": ["response", "products"], "total_path": ["response", "total_found"],
+             "fields": {"product_name": "name", "price": "offerPrice", ...}}
+
+        :param path: JSON file holding the templates (None keeps them in memory only)
+        """
+        self.path = path
+        self.templates = {}
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.templates = json.load(f)
+
+    def get(self, kind):
+        """
+        :param kind: "listing" or "detail"
+        :return: Template dict, or None if none has been learned
+        """
+        return self.templates.get(kind)
+
+    def learn(self, kind, page_url, responses):
+        """
+        Pick the response that carries the page's products and turn its
+        request into a template. Only requests whose URL contains the page's
+        id qualify, so the template can be filled in for any other page.
+
+        :param kind: "listing" or "detail"
+        :param page_url: URL of the page the responses were recorded on
+        :param responses: (request URL, decoded JSON) pairs from json_responses
+        :return: True if a template was learned
+        """
+        id_value = page_id(page_url)
+        if id_value is None:
+            return False
+
+        best, best_score = None, 0
+        for url, data in responses:
+            template = _template_url(url, id_value)
+            if template is None:
+                continue
+            template_url, page_param, page_value = template
+
+            if kind == "listing":
+                for records_path, records in _record_lists(data):
+                    fields = _field_map(records[:20], LISTING_FIELDS)
+                    if "product_name" not in fields or len(records) <= best_score:
+                        continue
+                    container = dig(data, records_path[:-1]) if records_path else None
+                    total_key = next((key for key in TOTAL_KEYS if isinstance(container, dict)
+                                      and isinstance(container.get(key), int)), None)
+                    best_score = len(records)
+                    best = {
+                        "url": template_url,
+                        "page_param": page_param,
+                        "first_page": page_value if page_param else None,
+                        "offset": page_param in OFFSET_PARAMS,
+                        "records_path": list(records_path),
+                        "total_path": list(records_path[:-1]) + [total_key] if total_key else None,
+                        "fields": fields,
+                    }
+            else:
+                for record_path, record in _objects(data):
+                    fields = _field_map([record], DETAIL_FIELDS)
+                    if len(fields) <= best_score:
+                        continue
+                    best_score = len(fields)
+                    best = {"url": template_url, "record_path": list(record_path), "fields": fields}
+
+        if best is None:
+            return False
+        self.templates[kind] = best
+        return True
+
+    def save(self):
+        if self.path:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(self.templates, f, indent=2)
+
+
+def _text(value):
+    # Flatten an API value into the text our CSV columns hold
+    if value is None:
+        return ""
+    if isinstance(value, dict):
+        value = value.get("name", "")
+    value = str(value).strip()
+    if "<" in value:
+        value = BeautifulSoup(value, "html.parser").get_text(" ", strip=True)
+    return value
+
+
+def _number(value):
+    # 816.0 -> "816", 4.25 -> "4.25"; text that isn't a bare number is returned as is
+    text = _text(value)
+    try:
+        number = float(text.replace(",", ""))
+    except ValueError:
+        return text
+    return str(int(number)) if number.is_integer() else str(number)
+
+
+def _is_number(text):
+    return re.fullmatch(r"\d+(\.\d+)?", text) is not None
+
+
+def _price(value):
+    # Listing cards show "₹816"
+    text = _number(value)
+    return f"₹{text}" if _is_number(text) else text
+
+
+def _discount(value):
+    # Listing cards show "8% Off", and nothing when there is no discount
+    text = _number(value)
+    if _is_number(text):
+        return f"{text}% Off" if float(text) else ""
+    return text
+
+
+def _rating(value):
+    # Detail pages show "4.3/5"; only the score is kept
+    return _number(_text(value).replace("/5", ""))
+
+
+def _count(value):
+    # Detail pages show "1234 ratings & 210 reviews"; only the count is kept
+    text = _number(value)
+    return text.split(" ")[0] if text else ""
+
+
+# Normalizers giving API values the same text as the HTML path (see specs.py)
+DETAIL_FORMATS = {
+    "rating": _rating,
+    "num_ratings": _count,
+    "description": _text,
+}
+
+
+def _link(value):
+    # Product links are joined onto base_url, so keep only path and query
+    value = _text(value)
+    if not value:
+        return ""
+    parsed = urlparse(value)
+    link = parsed.path if parsed.path.startswith("/") else "/" + parsed.path
+    return link + ("?" + parsed.query if parsed.query else "")
+
+
+class ApiClient:
+    def __init__(self, templates, session, timeout=15, max_pages=100, metrics=None):
+        """
+        Fetches listing and detail records straight from the JSON endpoints
+        described by ``templates``, following pagination until the listing
+        is exhausted. Every method returns None when the API can't serve a
+        page, so callers can fall back to scraping the HTML.
+
+        :param templates: ApiTemplates
+        :param session: Pooled requests.Session (e.g. FetchStrategy.session)
+        :param timeout: Request timeout in seconds
+        :param max_pages: Most pages fetched for one listing
+        :param metrics: Optional common.metrics.Metrics; pages are counted with source "api"
+        """
+        self.templates = templates
+        self.session = session
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self.metrics = metrics
+        self._stats = {"api": 0, "failed": 0}
+        self._stats_lock = threading.Lock()
+
+    def _record(self, kind, source):
+        with self._stats_lock:
+            self._stats[source] += 1
+        if self.metrics:
+            self.metrics.pages(kind, source).inc()
+
+    def _get(self, template, id_value, kind, page=None):
+        url = template["url"].replace("{id}", id_value)
+        params = {template["page_param"]: page} if page is not None and template.get("page_param") else None
+        start = time.perf_counter()
+        try:
+            response = self.session.get(url, params=params, timeout=self.timeout,
+                                        headers={"Accept": "application/json"})
+            data = response.json() if response.status_code == 200 else None
+        except (requests.RequestException, ValueError) as e:
+            print(f"API fetch failed for {url}: {e}")
+            data = None
+        if self.metrics:
+            self.metrics.stage(kind, "fetch").observe(time.perf_counter() - start)
+        self._record(kind, "api" if data is not None else "failed")
+        return data
+
+    def listing(self, listing_link):
+        """
+        :param listing_link: Listing page link, e.g. ``/makeup/lips/lipstick/c/249``
+        Pages are followed until the total is reached, a page comes back
+        empty or short, or a page holds no product not already seen (an
+        endpoint that ignores the page parameter serves the first page again).
+
+        :return: PRODUCT_CARD-shaped dicts for every page of the listing, or None
+        """
+        template = self.templates.get("listing")
+        id_value = page_id(listing_link)
+        if template is None or id_value is None:
+            return None
+
+        fields = template["fields"]
+        cards = []
+        seen = set()
+        page_size = None
+        page = template.get("first_page")
+        for _ in range(self.max_pages):
+            data = self._get(template, id_value, "listing", page)
+            if data is None:
+                # Nothing fetched means the HTML path should take over
+                return cards or None
+            records = dig(data, template["records_path"])
+            if not records:
+                break
+            new = 0
+            for record in records:
+                product_name = _text(record.get(fields["product_name"]))
+                card = {
+                    "product_name": product_name,
+                    "brand": _text(record.get(fields["brand"])) if "brand" in fields
+                    else (product_name.split()[0] if product_name else ""),
+                    "price": _price(record.get(fields.get("price"))),
+                    "discount": _discount(record.get(fields.get("discount"))),
+                    "product_link": _link(record.get(fields.get("product_link"))),
+                }
+                key = card["product_link"] or product_name
+                if key in seen:
+                    continue
+                seen.add(key)
+                cards.append(card)
+                new += 1
+
+            page_size = page_size or len(records)
+            total = dig(data, template["total_path"]) if template.get("total_path") else None
+            if (page is None or not new or len(records) < page_size
+                    or (isinstance(total, int) and len(cards) >= total)):
+                break
+            page += len(records) if template.get("offset") else 1
+        return cards
+
+    def detail(self, product_link):
+        """
+        :param product_link: Product page link
+        :return: PRODUCT_DETAIL-shaped dict, or None
+        """
+        template = self.templates.get("detail")
+        id_value = page_id(product_link)
+        if template is None or id_value is None:
+            return None
+
+        data = self._get(template, id_value, "detail")
+        record = dig(data, template["record_path"]) if data is not None else None
+        if not isinstance(record, dict):
+            return None
+        return {field: DETAIL_FORMATS[field](record.get(key)) for field, key in template["fields"].items()}
+
+    def print_stats(self):
+        with self._stats_lock:
+            print(f"JSON API: {self._stats['api']} pages fetched, {self._stats['failed']} failed")
@@ -1,20 +1,81 @@
-import csv
 import concurrent.futures
+import os
+import sys
+import time
 from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.chrome.options import Options
-from bs4 import BeautifulSoup
-import threading
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.frontier import Frontier
+from common.http_cache import HttpCache
+from common.metrics import Metrics
+from api_endpoints import ApiClient, ApiTemplates
+import api_endpoints
+from browser_pool import BrowserPool
+from checkpoint import CrawlCheckpoint
+from detail_cache import DetailCache
+from fetcher import FetchStrategy
+from page_profile import PageLoadProfile
+from parse_stage import ParseStage
+import parse_stage
+from sink import RowSink
+
+# Frontier queue holding product-type tasks when crawling across several nodes;
+# the crawl id is appended so every crawl gets a fresh queue
+FRONTIER_QUEUE = "nykaa:product_types"
 
 class NykaaScraper:
-    def __init__(self, max_workers=5):
+    def __init__(self, max_workers=5, max_pages_per_browser=200, max_detail_fetches=10, output_format="csv",
+                 cache_dir="http_cache", checkpoint_file="nykaa_checkpoint.sqlite3", parser=None,
+                 home_url="https://www.nykaa.com", base_url="https://nykaa.com", frontier_file=None,
+                 metrics_file="nykaa_metrics", detail_cache_size=10000, detail_cache_file=None,
+                 detail_cache_ttl=24 * 3600, parse_workers=None, page_profile=None,
+                 api_mode=None, api_templates_file="nykaa_api_templates.json", crawl_id=None):
         """
-        Initialize the Nykaa scraper with a shared browser and thread-safe mechanisms.
+        Initialize the Nykaa scraper with a pool of browsers, one per worker thread.
         
         :param max_workers: Number of concurrent threads for scraping
+        :param max_pages_per_browser: Pages a browser serves before it is recycled
+        :param max_detail_fetches: Global limit on product-detail pages fetched at once
+        :param output_format: "csv" or "parquet"
+        :param cache_dir: Directory for the conditional-GET response cache (None disables it)
+        :param checkpoint_file: Journal used to resume an interrupted crawl (CSV output only, None disables it)
+        :param parser: HTML parser backend, one of html_parser.BACKENDS (defaults to SCRAPER_HTML_PARSER)
+        :param home_url: Page holding the MegaDropdown category menu
+        :param base_url: Prefix for the relative listing and product links
+        :param frontier_file: Shared frontier database; set it on every node to split one crawl between them
+        :param metrics_file: Prefix of the <prefix>.json/.prom stage timings written at the end (None disables it)
+        :param detail_cache_size: Product-detail results kept in memory
+        :param detail_cache_file: SQLite file persisting product details across runs (None keeps them in memory only)
+        :param detail_cache_ttl: Seconds a persisted product detail stays valid
+        :param parse_workers: Processes parsing HTML into records (None uses every core, 0 parses in the I/O threads)
+        :param page_profile: PageLoadProfile for the browser fallback (request blocking, readiness selectors)
+        :param api_mode: None scrapes HTML only; "fast" reads listings and details from the JSON endpoints
+            in ``api_templates_file``; "discover" first records the endpoints a listing and a product page
+            call in the browser, saves their templates, then crawls as "fast"
+        :param api_templates_file: JSON file holding the learned endpoint templates
+        :param crawl_id: Names this crawl in the frontier; nodes with the same id split one crawl
+            (defaults to today's UTC date, so a new day starts a new crawl)
         """
+        self.home_url = home_url
+        self.base_url = base_url
+        
+        # Optional shared frontier so several processes/machines can split the crawl
+        self.frontier = None
+        if frontier_file:
+            self.frontier = Frontier(frontier_file)
+            self.frontier_queue = f"{FRONTIER_QUEUE}:{crawl_id or time.strftime('%Y-%m-%d', time.gmtime())}"
+            # Refuse before the output file is truncated: a finished crawl has nothing left to hand out
+            if self.frontier.finished(self.frontier_queue):
+                self.frontier.close()
+                raise ValueError(f"Crawl '{self.frontier_queue}' already finished in '{frontier_file}'; "
+                                 f"pass a new crawl_id to crawl again")
+        
+        # Per-stage timings and page counts, labeled by page kind
+        self.metrics = Metrics(site="nykaa")
+        self.metrics_file = metrics_file
+        
         # Shared browser configuration
         self.chrome_options = Options()
         self.chrome_options.add_argument("--headless")
@@ -22,53 +83,160 @@ class NykaaScraper:
         self.chrome_options.add_argument("--disable-blink-features=AutomationControlled")
         self.chrome_options.add_argument("--ignore-certificate-errors")
         self.chrome_options.add_argument("--allow-running-insecure-content")
-        self.chrome_options.add_argument(
-            "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.93 Safari/537.36"
-        )
+        self.user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.93 Safari/537.36"
+        self.chrome_options.add_argument(f"user-agent={self.user_agent}")
         
-        # Browser and synchronization
-        self.browser = None
-        self.browser_lock = threading.Lock()
+        # Skip images, fonts, styles and trackers; return at DOMContentLoaded
+        self.page_profile = page_profile or PageLoadProfile()
+        self.page_profile.apply(self.chrome_options)
+        
+        # Discovery reads the XHR/fetch calls pages make from Chrome's performance log
+        self.api_mode = api_mode
+        if api_mode == "discover":
+            self.chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        
+        # Browser pool: one driver per worker so threads never share a page
         self.max_workers = max_workers
+        self.browser_pool = BrowserPool(
+            self.chrome_options,
+            size=max_workers,
+            max_pages_per_browser=max_pages_per_browser,
+            driver_factory=lambda: self.page_profile.prepare(webdriver.Chrome(options=self.chrome_options))
+        )
+        
+        # I/O threads only download; parsing and extraction run in a process pool
+        self.parser = parser
+        self.parse_stage = ParseStage(parse_workers, metrics=self.metrics)
+        
+        # HTTP-first fetching; the browser pool is only used as a fallback
+        self.fetcher = FetchStrategy(
+            self._browser_get,
+            headers={"User-Agent": self.user_agent},
+            pool_size=max_workers + max_detail_fetches,
+            cache=HttpCache(cache_dir) if cache_dir else None,
+            metrics=self.metrics
+        )
         
-        # Initialization of output file
-        with open("nykaa_categories.csv", "w", newline="", encoding="utf-8") as csvfile:
-            writer = csv.writer(csvfile, delimiter=',')
-            writer.writerow(["Category", "Subcategory", "Product Type", "Product Name", "Brand", "Price", "Discount", "Rating", "Number of Ratings", "Description"])
+        # JSON endpoints, when their templates are known, replace rendering pages
+        self.api_templates = ApiTemplates(api_templates_file) if api_mode else None
+        self.api = None
+        
+        # A product listed under several product types is only fetched once
+        self.detail_cache = DetailCache(detail_cache_size, detail_cache_file, detail_cache_ttl)
+        
+        # Shared by all listings so the in-flight detail limit is global
+        self.detail_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_detail_fetches,
+            thread_name_prefix="nykaa-detail"
+        )
+        
+        # Resume from an earlier interrupted run if its journal is still around
+        self.checkpoint = None
+        if checkpoint_file and output_format == "csv":
+            self.checkpoint = CrawlCheckpoint(checkpoint_file)
+            if self.checkpoint.resuming:
+                print(f"Resuming crawl from checkpoint '{checkpoint_file}'")
+        
+        # Initialization of output file; a single writer thread owns it
+        self.output_file = f"nykaa_categories.{output_format}"
+        self.sink = RowSink(
+            self.output_file,
+            ["Category", "Subcategory", "Product Type", "Product Name", "Brand", "Price", "Discount", "Rating", "Number of Ratings", "Description"],
+            fmt=output_format,
+            append=self.checkpoint is not None and self.checkpoint.resuming,
+            metrics=self.metrics
+        )
 
-    def _get_shared_browser(self):
+    def _fetch_records(self, url, builder, kind):
         """
-        Get a shared browser instance, creating it if not exists.
-        Uses threading lock to ensure thread-safety.
+        Fetch a URL (HTTP first, browser as fallback) and build its records
+        in the parse stage.
         
-        :return: Configured Chrome WebDriver
+        :param url: URL to fetch
+        :param builder: Record builder from parse_stage for this page kind
+        :param kind: Page kind (home, listing, detail)
+        :return: Records, or None if the page could not be loaded
         """
-        with self.browser_lock:
-            if self.browser is None:
-                self.browser = webdriver.Chrome(options=self.chrome_options)
-            return self.browser
+        return self.fetcher.fetch(
+            url,
+            lambda markup, required: self.parse_stage.run(builder, markup, self.parser, required, kind=kind),
+            kind
+        )
 
-    def _safe_browser_get(self, url):
+    def _browser_get(self, url, kind="page"):
         """
-        Safely navigate to a URL with error handling.
+        Navigate to a URL in a pooled browser with error handling, and
+        wait until the page kind's content has rendered.
         
         :param url: URL to navigate to
-        :return: BeautifulSoup parsed page source
+        :param kind: Page kind used to label metrics and pick the readiness selector
+        :return: Rendered page source, or None if the page never became ready
         """
-        browser = self._get_shared_browser()
         try:
-            browser.get(url)
-            WebDriverWait(browser, 10).until(
-                EC.visibility_of_element_located((By.CSS_SELECTOR, "body"))
-            )
-            return BeautifulSoup(browser.page_source, "html.parser")
+            with self.browser_pool.lease() as browser:
+                browser.pages += 1
+                try:
+                    start = time.perf_counter()
+                    browser.driver.get(url)
+                    loaded = time.perf_counter()
+                    self.metrics.stage(kind, "fetch").observe(loaded - start)
+                    ready = self.page_profile.wait_ready(browser.driver, kind)
+                    self.metrics.stage(kind, "wait").observe(time.perf_counter() - loaded)
+                    if not ready:
+                        print(f"{url} never showed its {kind} content")
+                        return None
+                except TimeoutException as e:
+                    # A slow page is not a dead browser; keep it in the pool
+                    print(f"Timed out loading {url}: {e}")
+                    return None
+                return browser.driver.page_source
         except Exception as e:
             print(f"Error navigating to {url}: {e}")
             return None
 
+    def _record_api_calls(self, url, kind):
+        """
+        Load a page in the browser and learn the template of the JSON
+        endpoint that serves its products.
+        
+        :param url: Page URL
+        :param kind: "listing" or "detail"
+        :return: True if a template was learned
+        """
+        with self.browser_pool.lease() as browser:
+            browser.pages += 1
+            # Drop events left over from earlier pages
+            api_endpoints.performance_events(browser.driver)
+            browser.driver.get(url)
+            self.page_profile.wait_ready(browser.driver, kind)
+            events = api_endpoints.performance_events(browser.driver)
+            responses = api_endpoints.json_responses(browser.driver, events)
+        learned = self.api_templates.learn(kind, url, responses)
+        print(f"{'Learned' if learned else 'Found no'} {kind} API template from {len(responses)} JSON responses on {url}")
+        return learned
+
+    def discover_api(self, product_type_link):
+        """
+        Record the JSON calls behind a listing page and one of its product
+        pages, and save their URL and pagination templates.
+        
+        :param product_type_link: Listing page link to discover from
+        """
+        try:
+            self._record_api_calls(self.base_url + product_type_link, "listing")
+            cards = self._fetch_records(self.base_url + product_type_link, parse_stage.listing_records, "listing")
+            product_link = next((card["product_link"] for card in cards or [] if card["product_link"]), None)
+            if product_link:
+                self._record_api_calls(self.base_url + product_link, "detail")
+        except Exception as e:
+            print(f"API discovery failed on {product_type_link}: {e}")
+        self.api_templates.save()
+
     def scrape_product_details(self, product_link):
         """
-        Scrape detailed information for a single product.
+        Scrape detailed information for a single product, reusing the
+        result when the same product was already scraped (or is being
+        scraped right now) for another product type.
         
         :param product_link: Product page URL
         :return: Product details dictionary
@@ -76,24 +244,19 @@ class NykaaScraper:
         if not product_link:
             return {}
         
-        product_detail_page = self._safe_browser_get("https://nykaa.com" + product_link)
-        if not product_detail_page:
-            return {}
-        
-        rating = product_detail_page.select_one(".css-m6n3ou").text.strip().replace("/5", "") \
-            if product_detail_page.select_one(".css-m6n3ou") else ""
-        
-        num_ratings = product_detail_page.select_one(".css-1hvvm95").text.strip().split(" ")[0] \
-            if product_detail_page.select_one(".css-1hvvm95") else ""
-        
-        desc_section = product_detail_page.select_one("#content-details")
-        description = desc_section.get_text(separator=" ").strip() if desc_section else ""
+        return self.detail_cache.get_or_load(product_link, self._load_product_details)
+
+    def _load_product_details(self, product_link):
+        """
+        Fetch and extract one product page.
         
-        return {
-            "rating": rating,
-            "num_ratings": num_ratings,
-            "description": description
-        }
+        :param product_link: Product page URL
+        :return: Product details dictionary ({} on failure)
+        """
+        details = self.api.detail(product_link) if self.api else None
+        if details is None:
+            details = self._fetch_records(self.base_url + product_link, parse_stage.detail_records, "detail")
+        return details or {}
 
     def scrape_products(self, category_name, subcategory_name, product_type_name, product_type_link):
         """
@@ -103,92 +266,131 @@ class NykaaScraper:
         :param subcategory_name: Subcategory name
         :param product_type_name: Product type name
         :param product_type_link: Product type page URL
+        :return: False if the listing could not be fetched and the product type was skipped
         """
-        product_page = self._safe_browser_get("https://nykaa.com" + product_type_link)
-        if not product_page:
-            return
+        task_key = "\t".join([category_name, subcategory_name, product_type_name, product_type_link])
+        if self.checkpoint and self.checkpoint.is_done(task_key):
+            return True
         
-        with open("nykaa_categories.csv", "a", newline="", encoding="utf-8") as csvfile:
-            writer = csv.writer(csvfile, delimiter=',')
+        # The JSON API covers every page of the listing; the HTML only the first
+        cards = self.api.listing(product_type_link) if self.api else None
+        if cards is None:
+            cards = self._fetch_records(self.base_url + product_type_link, parse_stage.listing_records, "listing")
+        if cards is None:
+            return False
+        
+        # Fan out the detail fetches for the listing's product cards
+        products = []
+        for card in cards:
+            product_name, brand, price, discount = card["product_name"], card["brand"], card["price"], card["discount"]
+            product_link = card["product_link"]
+            details_future = self.detail_executor.submit(self.scrape_product_details, product_link)
+            products.append((product_name, brand, price, discount, details_future))
+        
+        # Keep listing order; each row waits only for its own detail page
+        rows = []
+        for product_name, brand, price, discount, details_future in products:
+            try:
+                product_details = details_future.result()
+            except Exception as e:
+                print(f"Error scraping details for {product_name}: {e}")
+                product_details = {}
             
-            for product in product_page.select(".productWrapper a"):
-                # Extract basic product information
-                product_name = product.select_one(".css-xrzmfa").text.strip() if product.select_one(".css-xrzmfa") else ""
-                price = product.select_one(".css-111z9ua").text.strip() if product.select_one(".css-111z9ua") else ""
-                discount = product.select_one(".css-cjd9an").text.strip() if product.select_one(".css-cjd9an") else ""
-                brand = product_name.split()[0] if product_name else ""
-                product_link = product.get("href", "")
-                
-                # Get detailed product information
-                product_details = self.scrape_product_details(product_link)
-                
-                writer.writerow([
-                    category_name, 
-                    subcategory_name, 
-                    product_type_name, 
-                    product_name, 
-                    brand, 
-                    price, 
-                    discount, 
-                    product_details.get("rating", ""),
-                    product_details.get("num_ratings", ""),
-                    product_details.get("description", "")
-                ])
+            rows.append([
+                category_name, 
+                subcategory_name, 
+                product_type_name, 
+                product_name, 
+                brand, 
+                price, 
+                discount, 
+                product_details.get("rating", ""),
+                product_details.get("num_ratings", ""),
+                product_details.get("description", "")
+            ])
+        
+        # Journal the product type only once its rows are on disk
+        on_flushed = None
+        if self.checkpoint:
+            on_flushed = lambda: self.checkpoint.record(task_key)
+        self.sink.write_rows(rows, on_flushed=on_flushed)
+        return True
 
     def main(self):
         """
         Main scraping method to navigate and extract category, subcategory, and product information.
         """
-        # Initial page navigation
-        home_page = self._safe_browser_get("https://www.nykaa.com")
-        if not home_page:
-            print("Failed to load home page")
-            return
-        
-        # Concurrent scraping of product types
-        product_tasks = []
-        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            for category_section in home_page.select(".MegaDropdownHeadingbox"):
-                category_link_tag = category_section.find("a")
-                if not category_link_tag:
-                    continue
-                category_name = category_link_tag.text.strip()
-                
-                for subcategory in category_section.select(".MegaDropdown-ContentInner .MegaDropdown-ContentHeading"):
-                    subcategory_link_tag = subcategory.find("a")
-                    if not subcategory_link_tag:
-                        continue
-                    subcategory_name = subcategory_link_tag.text.strip()
+        completed = False
+        try:
+            # Initial page navigation
+            tasks = self._fetch_records(self.home_url, parse_stage.home_records, "home")
+            if tasks is None:
+                print("Failed to load home page")
+                return
+            
+            if self.api_mode == "discover" and tasks:
+                self.discover_api(tasks[0][3])
+            if self.api_templates and (self.api_templates.get("listing") or self.api_templates.get("detail")):
+                self.api = ApiClient(self.api_templates, self.fetcher.session, metrics=self.metrics)
+        
+            # Concurrent scraping of product types
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                if self.frontier:
+                    # Seeding is idempotent, so every node can do it; each worker
+                    # thread then pulls product types until the shared queue is done
+                    self.frontier.add(self.frontier_queue, [("\t".join(task), task) for task in tasks])
                     
-                    product_list = subcategory.find_next_sibling("ul")
-                    if not product_list:
-                        continue
+                    def handle(key, task):
+                        # Release a skipped product type so it is retried, not acked
+                        if not self.scrape_products(*task):
+                            raise RuntimeError("listing could not be fetched")
                     
-                    for product_type in product_list.select("li a"):
-                        product_type_name = product_type.text.strip()
-                        product_type_link = product_type.get("href", "")
-                        
-                        product_tasks.append(
-                            executor.submit(
-                                self.scrape_products, 
-                                category_name, 
-                                subcategory_name, 
-                                product_type_name, 
-                                product_type_link
-                            )
-                        )
+                    product_tasks = [
+                        executor.submit(self.frontier.drain, self.frontier_queue, handle)
+                        for _ in range(self.max_workers)
+                    ]
+                else:
+                    product_tasks = [executor.submit(self.scrape_products, *task) for task in tasks]
             
-            # Wait for all tasks to complete
-            concurrent.futures.wait(product_tasks)
-        
-        # Close the browser at the end
-        with self.browser_lock:
-            if self.browser:
-                self.browser.quit()
+                # Wait for all tasks to complete
+                concurrent.futures.wait(product_tasks)
+            
+            # Keep the checkpoint to resume from unless every product type was written
+            failed = sum(1 for task in product_tasks if task.exception() is not None or task.result() is False)
+            if self.frontier:
+                failed += self.frontier.given_up(self.frontier_queue)
+            if failed:
+                print(f"{failed} product types failed or were skipped")
+            completed = not failed
+        finally:
+            # Close the browsers at the end, even if the crawl failed
+            self.detail_executor.shutdown(wait=True)
+            self.parse_stage.close()
+            self.browser_pool.close()
+            self.fetcher.close()
+            self.fetcher.print_stats()
+            if self.api:
+                self.api.print_stats()
+            self.detail_cache.print_stats()
+            for result, count in self.detail_cache.stats().items():
+                self.metrics.counter("detail_cache_total", result=result).inc(count)
+            self.detail_cache.close()
+            self.sink.close()
+            if self.metrics_file:
+                self.metrics.export(self.metrics_file)
+                print(f"Metrics written to {self.metrics_file}.json and {self.metrics_file}.prom")
+            if self.frontier:
+                self.frontier.close()
+            if self.checkpoint:
+                # A finished crawl starts the next run from scratch
+                if completed:
+                    self.checkpoint.finish()
+                else:
+                    self.checkpoint.close()
         
-        print("CSV file 'nykaa_categories.csv' created successfully.")
+        print(f"Output file '{self.output_file}' created successfully.")
 
 # Script entry point
 if __name__ == "__main__":
-    scraper = NykaaScraper()
+    scraper = NykaaScraper(api_mode=os.environ.get("NYKAA_API_MODE") or None)
     scraper.main()
\ No newline at end of file
@@ -0,0 +1,139 @@
+import queue
+import threading
+from contextlib import contextmanager
+from selenium import webdriver
+
+
+class PooledBrowser:
+    """
+    A WebDriver leased from a BrowserPool, with the bookkeeping the pool
+    needs to decide when it should be recycled.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.broken = False
+
+
+class BrowserPool:
+    def __init__(self, chrome_options, size=5, max_pages_per_browser=200, driver_factory=None):
+        """
+        Bounded pool of Chrome WebDrivers, one per concurrent worker.
+
+        Browsers are created lazily up to ``size``. A leased browser is
+        returned to the pool after each task, and is quit and replaced
+        once it has served ``max_pages_per_browser`` pages, fails a health
+        check, or is marked broken by the caller.
+
+        :param chrome_options: Options used to start every browser
+        :param size: Maximum number of live browsers
+        :param max_pages_per_browser: Pages served before a browser is recycled
+        :param driver_factory: Optional callable returning a new driver (defaults to Chrome)
+        """
+        self.chrome_options = chrome_options
+        self.size = size
+        self.max_pages_per_browser = max_pages_per_browser
+        self.driver_factory = driver_factory or (lambda: webdriver.Chrome(options=self.chrome_options))
+
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+        self._live = set()
+        self._closed = False
+
+    def _create(self):
+        browser = PooledBrowser(self.driver_factory())
+        with self._lock:
+            self._live.add(browser)
+        return browser
+
+    def _destroy(self, browser):
+        with self._lock:
+            self._live.discard(browser)
+        try:
+            browser.driver.quit()
+        except Exception as e:
+            print(f"Error closing browser: {e}")
+
+    @staticmethod
+    def _is_healthy(browser):
+        """
+        Cheap liveness probe: a crashed or disconnected driver raises here.
+        """
+        if browser.broken:
+            return False
+        try:
+            browser.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def acquire(self, timeout=None):
+        """
+        Lease a browser, blocking until one of the ``size`` slots is free.
+
+        :param timeout: Seconds to wait for a free slot (None waits forever)
+        :return: PooledBrowser
+        """
+        if self._closed:
+            raise RuntimeError("BrowserPool is closed")
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError("Timed out waiting for a browser")
+
+        try:
+            while True:
+                try:
+                    browser = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._create()
+                if self._is_healthy(browser):
+                    return browser
+                self._destroy(browser)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, browser):
+        """
+        Return a leased browser, recycling it if it is broken or worn out.
+
+        :param browser: PooledBrowser previously returned by acquire()
+        """
+        try:
+            if self._closed or browser.broken or browser.pages >= self.max_pages_per_browser:
+                self._destroy(browser)
+            else:
+                self._idle.put(browser)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def lease(self, timeout=None):
+        """
+        Context manager form of acquire()/release(). Any exception raised
+        inside the block marks the browser as broken so it gets recycled.
+        """
+        browser = self.acquire(timeout=timeout)
+        try:
+            yield browser
+        except Exception:
+            browser.broken = True
+            raise
+        finally:
+            self.release(browser)
+
+    def close(self):
+        """
+        Quit every browser the pool has started.
+        """
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                break
+        with self._lock:
+            live = list(self._live)
+        for browser in live:
+            self._destroy(browser)
@@ -1,23 +1,43 @@
 import pandas as pd
-import google.generativeai as genai
+import concurrent.futures
 import csv
+import hashlib
+import json
+import random
+import sqlite3
+import threading
 import time
 import os
+import sys
+from collections import deque
+
+try:
+    import google.generativeai as genai
+except ImportError:
+    genai = None
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.metrics import Metrics
+from category_prompt import CategoryPrompt, estimate_tokens
+from prefilter import CategoryPrefilter
+
+MODEL_NAME = "gemini-2.0-flash"
+GENERATION_CONFIG = {
+    "temperature": 0.2,
+    "top_p": 0.95,
+    "top_k": 40,
+}
 
 # Configure the Gemini API
 def configure_genai(api_key):
+    if genai is None:
+        raise ImportError("google-generativeai is required to call Gemini (pip install google-generativeai)")
     genai.configure(api_key=api_key)
     
     # Set up the model
-    generation_config = {
-        "temperature": 0.2,
-        "top_p": 0.95,
-        "top_k": 40,
-    }
-    
     return genai.GenerativeModel(
-        model_name="gemini-2.0-flash",
-        generation_config=generation_config
+        model_name=MODEL_NAME,
+        generation_config=GENERATION_CONFIG
     )
 
 def load_data(campaign_file, category_file):
@@ -26,21 +46,22 @@ def load_data(campaign_file, category_file):
     categories_df = pd.read_csv(category_file)
     return campaigns_df, categories_df
 
-def check_all_categories(model, campaign_text, categories_df):
+def check_all_categories(model, campaign_text, categories_df, cache=None, category_prompt=None):
     """Check a campaign against all categories at once"""
-    # Format all categories for the prompt
-    categories_list = []
-    for _, category in categories_df.iterrows():
-        cat_id = category['CategoryId']
-        cat_items = [str(cat_id)] + [cat for cat in [category['Category1'], category['Category2'], category['Category3']] if not pd.isna(cat)]
-        categories_list.append(" - ".join(cat_items))
+    # Compile the category tree once and pass it in when checking many campaigns
+    category_prompt = category_prompt or CategoryPrompt(categories_df)
+    categories_str = category_prompt.render()
     
-    categories_str = "\n".join(categories_list)
+    if cache:
+        key = cache.key(model, campaign_text, categories_str)
+        matches = cache.get(key)
+        if matches is not None:
+            return matches
     
     prompt = f"""
     Campaign Text: "{campaign_text}"
     
-    Categories (ID - Categories):
+    {CategoryPrompt.HEADER}
     {categories_str}
     
     Which category IDs match with this campaign text? Respond with ONLY a CSV format:
@@ -76,27 +97,405 @@ def check_all_categories(model, campaign_text, categories_df):
                 except:
                     continue
     
+    if cache:
+        cache.put(key, matches)
     return matches
 
-def main(api_key, campaign_file, category_file, output_file):
-    # Set up Gemini
-    model = configure_genai(api_key)
+class MatchCache:
+    """Persistent, content-addressed cache of campaign -> category matches.
+    
+    Entries are keyed on the campaign text, a hash of the category list, the
+    model name and the generation config, so editing any of them misses the
+    cache. The least recently used entries beyond ``max_entries`` are evicted,
+    as are entries older than ``ttl`` seconds (None keeps them forever).
+    """
+    
+    def __init__(self, path="match_cache.sqlite3", max_entries=100000, ttl=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS matches ("
+            "key TEXT PRIMARY KEY, matches TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS matches_accessed ON matches (accessed_at)")
+        self.db.commit()
+    
+    @staticmethod
+    def key(model, campaign_text, categories_str):
+        """Content hash identifying one campaign/category-set/model combination"""
+        signature = {
+            "campaign": str(campaign_text),
+            "categories": hashlib.sha256(categories_str.encode("utf-8")).hexdigest(),
+            "model": getattr(model, "model_name", type(model).__name__),
+            "config": GENERATION_CONFIG,
+        }
+        return hashlib.sha256(json.dumps(signature, sort_keys=True).encode("utf-8")).hexdigest()
+    
+    def get(self, key):
+        """Return cached matches for key, or None"""
+        now = time.time()
+        with self.lock:
+            row = self.db.execute("SELECT matches, created_at FROM matches WHERE key = ?", (key,)).fetchone()
+            if row is None or (self.ttl is not None and now - row[1] > self.ttl):
+                self.misses += 1
+                return None
+            self.db.execute("UPDATE matches SET accessed_at = ? WHERE key = ?", (now, key))
+            self.db.commit()
+            self.hits += 1
+            return json.loads(row[0])
+    
+    def put(self, key, matches):
+        now = time.time()
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO matches VALUES (?, ?, ?, ?)",
+                (key, json.dumps(matches), now, now)
+            )
+            if self.ttl is not None:
+                self.db.execute("DELETE FROM matches WHERE created_at < ?", (now - self.ttl,))
+            self.db.execute(
+                "DELETE FROM matches WHERE key IN ("
+                "SELECT key FROM matches ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            self.db.commit()
+    
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+def check_campaign_batch(model, campaigns, categories_str):
+    """Check several campaigns against all categories in one prompt.
+    
+    campaigns is a list of (campaignId, campaignText); returns {campaignId: [matches]}.
+    """
+    campaigns_str = "\n".join(f'{campaign_id} - "{campaign_text}"' for campaign_id, campaign_text in campaigns)
+    
+    prompt = f"""
+    Campaigns (ID - Campaign Text):
+    {campaigns_str}
+    
+    {CategoryPrompt.HEADER}
+    {categories_str}
+    
+    For each campaign, which category IDs match with its text? Respond with ONLY a CSV format:
+    
+    campaignId,categoryId,match
+    
+    Where 'match' is either 'strong' or 'medium'. Only include categories that have a match.
+    Do not include categories with no match.
+    Do not include any explanations or additional text.
+    """
+    
+    response = model.generate_content(prompt)
+    return parse_batch_response(response.text, [campaign_id for campaign_id, _ in campaigns])
+
+def parse_batch_response(response_text, campaign_ids):
+    """Parse campaignId,categoryId,match lines into {campaignId: [matches]}"""
+    results = {str(campaign_id): [] for campaign_id in campaign_ids}
+    
+    for line in response_text.strip().split('\n'):
+        parts = [part.strip() for part in line.split(',')]
+        if len(parts) < 3 or parts[0].lower() == "campaignid":
+            continue
+        campaign_id, category_id, match_type = parts[0], parts[1], parts[2].lower()
+        if campaign_id in results and match_type in ["strong", "medium"]:
+            results[campaign_id].append({"categoryId": category_id, "match": match_type})
+    
+    return results
+
+class RateLimiter:
+    """Thread-safe sliding-window limiter for requests and tokens per minute"""
     
+    def __init__(self, requests_per_minute, tokens_per_minute, window=60.0):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.window = window
+        self.events = deque()
+        self.tokens_in_window = 0
+        self.lock = threading.Lock()
+    
+    def acquire(self, tokens):
+        """Block until a request of ``tokens`` fits in the current window"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                while self.events and now - self.events[0][0] >= self.window:
+                    self.tokens_in_window -= self.events.popleft()[1]
+                
+                fits_requests = len(self.events) < self.requests_per_minute
+                # A single oversized request is let through on an empty window
+                fits_tokens = not self.events or self.tokens_in_window + tokens <= self.tokens_per_minute
+                if fits_requests and fits_tokens:
+                    self.events.append((now, tokens))
+                    self.tokens_in_window += tokens
+                    return
+                wait = self.window - (now - self.events[0][0])
+            time.sleep(max(wait, 0.01))
+
+def is_rate_limit_error(error):
+    """True for HTTP 429 / ResourceExhausted errors from the Gemini client"""
+    return (
+        getattr(error, "code", None) == 429
+        or type(error).__name__ in ("ResourceExhausted", "TooManyRequests", "RateLimitError")
+        or "429" in str(error)
+    )
+
+def call_with_retry(func, max_retries=5, base_delay=2.0):
+    """Call func(), retrying rate-limit errors with exponential backoff and jitter"""
+    for attempt in range(max_retries + 1):
+        try:
+            return func()
+        except Exception as e:
+            if attempt == max_retries or not is_rate_limit_error(e):
+                raise
+            delay = base_delay * (2 ** attempt) * (0.5 + random.random())
+            print(f"  Rate limited ({e}); retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+def match_campaigns(model, campaigns, categories_df, batch_size=10, max_workers=4,
+                    requests_per_minute=60, tokens_per_minute=1000000, cache=None,
+                    top_k=None, prefilter=None, category_token_budget=None, category_prompt=None, metrics=None):
+    """Match campaigns to categories with batched, concurrent, rate-limited model calls.
+    
+    campaigns is a list of (campaignId, campaignText); returns {campaignId: [matches]}.
+    Campaigns of a failed batch are left out, so callers can retry them later.
+    With a MatchCache, only campaigns that aren't cached are sent to the model.
+    With top_k, each prompt only lists the top_k local candidates of its campaigns.
+    With category_token_budget, a category list over the budget is split across
+    several calls per batch and their matches are merged.
+    Timings and call/token counts are recorded in metrics (a common.metrics.Metrics).
+    """
+    metrics = metrics or Metrics(site="nykaa")
+    category_prompt = category_prompt or CategoryPrompt(categories_df)
+    categories_str = category_prompt.render()
+    limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+    
+    # The candidate list depends on top_k, so it is part of the cache key
+    cache_categories = categories_str if not top_k else f"{categories_str}\n#top_k={top_k}"
+    
+    results = {}
+    keys = {}
+    pending = []
+    for campaign_id, campaign_text in campaigns:
+        if cache:
+            keys[campaign_id] = cache.key(model, campaign_text, cache_categories)
+            matches = cache.get(keys[campaign_id])
+            if matches is not None:
+                results[campaign_id] = matches
+                continue
+        pending.append((campaign_id, campaign_text))
+    
+    if cache:
+        metrics.counter("match_cache_total", result="hit").inc(len(campaigns) - len(pending))
+        metrics.counter("match_cache_total", result="miss").inc(len(pending))
+        print(f"Match cache: {len(campaigns) - len(pending)} cached, {len(pending)} to query")
+    batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+    
+    candidates = None
+    if top_k and pending:
+        # Score every pending campaign locally and only send each batch the
+        # union of its campaigns' candidates
+        start = time.perf_counter()
+        prefilter = prefilter or CategoryPrefilter(categories_df)
+        candidates = prefilter.top_k([str(text) for _, text in pending], top_k)
+        metrics.stage("match", "prefilter").observe(time.perf_counter() - start)
+    
+    # One call per (batch, category block); blocks stay within the token budget
+    calls = []
+    for index, batch in enumerate(batches):
+        positions = None
+        if candidates is not None:
+            start = index * batch_size
+            positions = set(candidates[start:start + len(batch)].ravel().tolist())
+        for block in category_prompt.chunks(category_token_budget, positions):
+            calls.append((index, block))
+    remaining = [0] * len(batches)
+    for index, _ in calls:
+        remaining[index] += 1
+    batch_results = [{str(campaign_id): [] for campaign_id, _ in batch} for batch in batches]
+    failed = [False] * len(batches)
+    
+    def run_batch(batch, batch_categories):
+        # Prompt size is dominated by the category list plus the campaign texts
+        tokens = estimate_tokens(batch_categories) + sum(estimate_tokens(str(text)) + 10 for _, text in batch)
+        
+        def attempt():
+            start = time.perf_counter()
+            limiter.acquire(tokens)
+            acquired = time.perf_counter()
+            metrics.stage("match", "throttle").observe(acquired - start)
+            try:
+                result = check_campaign_batch(model, batch, batch_categories)
+            except Exception as e:
+                outcome = "rate_limited" if is_rate_limit_error(e) else "failed"
+                metrics.counter("match_calls_total", outcome=outcome).inc()
+                raise
+            finally:
+                metrics.stage("match", "llm").observe(time.perf_counter() - acquired)
+            metrics.counter("match_calls_total", outcome="ok").inc()
+            metrics.counter("match_prompt_tokens_total").inc(tokens)
+            return result
+        
+        return call_with_retry(attempt)
+    
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(run_batch, batches[index], block): index
+            for index, block in calls
+        }
+        for future in concurrent.futures.as_completed(futures):
+            index = futures[future]
+            batch = batches[index]
+            remaining[index] -= 1
+            try:
+                for campaign_id, matches in future.result().items():
+                    batch_results[index][campaign_id].extend(matches)
+            except Exception as e:
+                print(f"Batch {[campaign_id for campaign_id, _ in batch]} failed: {e}")
+                failed[index] = True
+            if remaining[index]:
+                continue
+            
+            # Failed batches are neither returned nor cached, so the next run retries them
+            if failed[index]:
+                continue
+            results.update(batch_results[index])
+            if cache:
+                for campaign_id, matches in batch_results[index].items():
+                    cache.put(keys[campaign_id], matches)
+    
+    return results
+
+def campaign_fingerprint(campaign_text):
+    """Hash of a campaign's text, to tell an edited campaign from an unchanged one"""
+    return hashlib.sha256(str(campaign_text).encode("utf-8")).hexdigest()
+
+def load_campaign_snapshot(path):
+    """Return {campaignId: fingerprint} of the campaigns an earlier run matched ({} if none)"""
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, newline='') as f:
+        return {row['campaignId']: row['fingerprint'] for row in csv.DictReader(f)}
+
+def save_campaign_snapshot(path, campaigns):
+    """Record the campaigns this run matched, for the next incremental run"""
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['campaignId', 'fingerprint'])
+        writer.writerows((campaign_id, campaign_fingerprint(text)) for campaign_id, text in campaigns)
+
+def load_category_snapshot(path):
+    """Return the set of CategoryIds an earlier run matched against (None if there was no run)"""
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, newline='') as f:
+        return {row['CategoryId'] for row in csv.DictReader(f)}
+
+def save_category_snapshot(path, categories_df):
+    """Record the CategoryIds this run matched against, for the next incremental run"""
+    categories_df[['CategoryId']].to_csv(path, index=False)
+
+def main(api_key, campaign_file, category_file, output_file, batch_size=10, max_workers=4,
+         requests_per_minute=60, tokens_per_minute=1000000, model=None, cache_file="match_cache.sqlite3",
+         top_k=None, local_only=False, strong_threshold=0.35, medium_threshold=0.2,
+         category_token_budget=None, incremental=False, metrics_file="match_metrics",
+         campaign_snapshot_file="campaign_snapshot.csv", category_snapshot_file="category_snapshot.csv"):
     # Load data
     campaigns_df, categories_df = load_data(campaign_file, category_file)
+    campaigns = [(str(campaign['campaignId']), campaign['campaignText']) for _, campaign in campaigns_df.iterrows()]
     
-    # Prepare output
-    output_rows = []
+    # (campaigns, categories) pairs to match; a full run matches everything
+    jobs = [(campaigns, categories_df)]
+    previous_rows = []
+    category_ids = set(categories_df['CategoryId'].astype(str))
+    previous_category_ids = load_category_snapshot(category_snapshot_file) if incremental else None
+    if previous_category_ids is not None and os.path.exists(output_file):
+        # Incremental run: campaigns the last run matched with the same text
+        # keep their matches, except those to categories removed since, and
+        # are only matched against the categories added since. New and edited
+        # campaigns are matched against every category.
+        added = category_ids - previous_category_ids
+        removed = previous_category_ids - category_ids
+        snapshot = load_campaign_snapshot(campaign_snapshot_file)
+        unchanged = {
+            campaign_id for campaign_id, campaign_text in campaigns
+            if snapshot.get(campaign_id) == campaign_fingerprint(campaign_text)
+        }
+        with open(output_file, newline='') as f:
+            previous_rows = [
+                row for row in csv.DictReader(f)
+                if row['categoryId'] not in removed and row['campaignId'] in unchanged
+            ]
+        jobs = [
+            ([campaign for campaign in campaigns if campaign[0] not in unchanged], categories_df),
+            ([campaign for campaign in campaigns if campaign[0] in unchanged],
+             categories_df[categories_df['CategoryId'].astype(str).isin(added)]),
+        ]
+        print(f"Incremental run: {len(added)} categories added, {len(removed)} removed, "
+              f"{len(campaigns) - len(unchanged)} new or edited campaigns, {len(previous_rows)} earlier matches kept")
     
-    # Process campaigns one by one
-    for _, campaign in campaigns_df.iterrows():
-        campaign_id = campaign['campaignId']
-        campaign_text = campaign['campaignText']
-        
-        print(f"Processing campaign: {campaign_id} - {campaign_text}")
+    metrics = Metrics(site="nykaa")
+    cache = None
+    if not local_only:
+        # Set up Gemini (or use the model passed in, e.g. a fake model in tests)
+        model = model or configure_genai(api_key)
+        # Reuse earlier answers for campaigns whose text and categories haven't changed
+        cache = MatchCache(cache_file) if cache_file else None
+    
+    results = {}
+    # Campaigns whose every job succeeded; the rest stay out of the snapshot, so the next run redoes them
+    matched = set()
+    for job_campaigns, job_categories in jobs:
+        if not job_campaigns:
+            continue
+        if job_categories.empty:
+            matched.update(campaign_id for campaign_id, _ in job_campaigns)
+            continue
+        start = time.perf_counter()
+        prefilter = CategoryPrefilter(job_categories) if top_k or local_only else None
+        if prefilter:
+            metrics.stage("match", "prefilter_build").observe(time.perf_counter() - start)
         
-        # Check this campaign against all categories at once
-        matches = check_all_categories(model, campaign_text, categories_df)
+        if local_only:
+            # Label matches from local similarity scores alone, without calling the model
+            print(f"Matching {len(job_campaigns)} campaigns locally")
+            start = time.perf_counter()
+            local = prefilter.local_matches(
+                [str(campaign_text) for _, campaign_text in job_campaigns],
+                strong_threshold=strong_threshold,
+                medium_threshold=medium_threshold
+            )
+            metrics.stage("match", "prefilter").observe(time.perf_counter() - start)
+            job_results = {campaign_id: matches for (campaign_id, _), matches in zip(job_campaigns, local)}
+        else:
+            print(f"Processing {len(job_campaigns)} campaigns in batches of {batch_size}")
+            job_results = match_campaigns(
+                model, job_campaigns, job_categories,
+                batch_size=batch_size,
+                max_workers=max_workers,
+                requests_per_minute=requests_per_minute,
+                tokens_per_minute=tokens_per_minute,
+                cache=cache,
+                top_k=top_k,
+                prefilter=prefilter,
+                category_token_budget=category_token_budget,
+                category_prompt=CategoryPrompt(job_categories),
+                metrics=metrics
+            )
+        results.update(job_results)
+        matched.update(job_results)
+    if cache:
+        cache.close()
+    
+    # Prepare output, in campaign order (after the kept matches of an incremental run)
+    output_rows = previous_rows
+    for campaign_id, campaign_text in campaigns:
+        matches = results.get(campaign_id, [])
         
         # Add matches to output
         for match in matches:
@@ -107,6 +506,7 @@ def main(api_key, campaign_file, category_file, output_file):
             })
         
         # Print summary for this campaign
+        print(f"Campaign: {campaign_id} - {campaign_text}")
         if matches:
             print(f"  Found {len(matches)} matches for campaign {campaign_id}")
             for match in matches:
@@ -115,23 +515,36 @@ def main(api_key, campaign_file, category_file, output_file):
             print(f"  No matches found for campaign {campaign_id}")
         
         print("---")
-        
-        # Add a small delay before processing the next campaign
-        time.sleep(1)
     
     # Write results to CSV
+    start = time.perf_counter()
     with open(output_file, 'w', newline='') as f:
         writer = csv.DictWriter(f, fieldnames=['campaignId', 'categoryId', 'match'])
         writer.writeheader()
         writer.writerows(output_rows)
+    metrics.stage("output", "write").observe(time.perf_counter() - start)
+    if campaign_snapshot_file and category_snapshot_file:
+        save_campaign_snapshot(
+            campaign_snapshot_file, [campaign for campaign in campaigns if campaign[0] in matched]
+        )
+        save_category_snapshot(category_snapshot_file, categories_df)
     
     print(f"Processing complete. Results written to {output_file}")
+    if metrics_file:
+        metrics.export(metrics_file)
+        print(f"Metrics written to {metrics_file}.json and {metrics_file}.prom")
 
 if __name__ == "__main__":
     # Replace with your actual Gemini API key
    
     API_KEY = os.getenv("GEMINI_API_KEY")
-    if not API_KEY:
+    # Set MATCH_LOCAL_ONLY=1 to label matches from local similarity scores, with no model at all.
+    # Calibrate the thresholds first (python prefilter.py): the marketing copy in campaigns.csv
+    # scores at most 0.174 against any category, so the defaults label nothing there.
+    LOCAL_ONLY = os.getenv("MATCH_LOCAL_ONLY") == "1"
+    STRONG_THRESHOLD = float(os.getenv("MATCH_STRONG_THRESHOLD", "0.35"))
+    MEDIUM_THRESHOLD = float(os.getenv("MATCH_MEDIUM_THRESHOLD", "0.2"))
+    if not API_KEY and not LOCAL_ONLY:
         raise ValueError("API key not found. Please set the GEMINI_API_KEY environment variable.")
     
     # File paths
@@ -139,4 +552,29 @@ if __name__ == "__main__":
     CATEGORY_FILE = "categories.csv"
     OUTPUT_FILE = "campaign_category_matches.csv"
     
-    main(API_KEY, CAMPAIGN_FILE, CATEGORY_FILE, OUTPUT_FILE)
\ No newline at end of file
+    # Batching and rate limits (match these to your API quota)
+    BATCH_SIZE = int(os.getenv("MATCH_BATCH_SIZE", "10"))
+    MAX_WORKERS = int(os.getenv("MATCH_MAX_WORKERS", "4"))
+    REQUESTS_PER_MINUTE = int(os.getenv("GEMINI_RPM", "60"))
+    TOKENS_PER_MINUTE = int(os.getenv("GEMINI_TPM", "1000000"))
+    
+    # Only send each batch the best local candidates (0, the default, sends every category).
+    # Opt-in: check recall on your data with python prefilter.py first; on the repo's own
+    # matches top-20 keeps 39 of 219 (14 of 44 strong), and only top-150 keeps every strong one.
+    TOP_K = int(os.getenv("MATCH_TOP_K", "0")) or None
+    # Split the category list across calls above this many tokens (0 never splits)
+    CATEGORY_TOKEN_BUDGET = int(os.getenv("MATCH_CATEGORY_TOKEN_BUDGET", "0")) or None
+    # Set MATCH_INCREMENTAL=1 to keep the last run's matches and only match what changed since
+    INCREMENTAL = os.getenv("MATCH_INCREMENTAL") == "1"
+    
+    main(API_KEY, CAMPAIGN_FILE, CATEGORY_FILE, OUTPUT_FILE,
+         batch_size=BATCH_SIZE,
+         max_workers=MAX_WORKERS,
+         requests_per_minute=REQUESTS_PER_MINUTE,
+         tokens_per_minute=TOKENS_PER_MINUTE,
+         top_k=TOP_K,
+         local_only=LOCAL_ONLY,
+         strong_threshold=STRONG_THRESHOLD,
+         medium_threshold=MEDIUM_THRESHOLD,
+         category_token_budget=CATEGORY_TOKEN_BUDGET,
+         incremental=INCREMENTAL)
\ No newline at end of file
@@ -0,0 +1,115 @@
+import pandas as pd
+
+
+def estimate_tokens(text):
+    """Rough token count (about 4 characters per token) for rate limiting and budgets"""
+    return len(text) // 4 + 1
+
+
+def _name(value):
+    return "" if pd.isna(value) else str(value).strip()
+
+
+class CategoryPrompt:
+    """Category list compiled once into a compact, hierarchical prompt block.
+
+    Instead of one "ID - Category1 - Category2 - Category3" line per category,
+    each Category1 is written once and each Category2 once beneath it, with
+    IDs only on the leaves:
+
+        makeup
+         Face: 1 Foundation; 2 Compact; 3 Concealer
+         Eyes: 11 Kajal; 12 Eyeliner
+
+    ``render`` returns the whole tree (or a subset of rows, e.g. prefilter
+    candidates) and ``chunks`` splits it so no block exceeds a token budget.
+    """
+
+    HEADER = "Categories (Category1, then Category2: ID Category3; ...):"
+
+    def __init__(self, categories_df):
+        # Category1 -> Category2 -> [(row position, leaf text)], in table order
+        self.tree = {}
+        self.size = len(categories_df)
+        columns = categories_df[['CategoryId', 'Category1', 'Category2', 'Category3']]
+        for position, (cat_id, category1, category2, category3) in enumerate(columns.itertuples(index=False)):
+            leaf = f"{cat_id} {_name(category3)}".rstrip()
+            self.tree.setdefault(_name(category1), {}).setdefault(_name(category2), []).append((position, leaf))
+        self._full = self.render_lines()
+
+    def render_lines(self, positions=None):
+        """Lines of the compact tree, optionally limited to the given row positions"""
+        wanted = None if positions is None else set(positions)
+        lines = []
+        for category1, groups in self.tree.items():
+            group_lines = []
+            for category2, leaves in groups.items():
+                names = [leaf for position, leaf in leaves if wanted is None or position in wanted]
+                if names:
+                    group_lines.append(f" {category2}: " + "; ".join(names))
+            if group_lines:
+                lines.append(category1)
+                lines.extend(group_lines)
+        return lines
+
+    def render(self, positions=None):
+        """Compact text of the tree, optionally limited to the given row positions"""
+        lines = self._full if positions is None else self.render_lines(positions)
+        return "\n".join(lines)
+
+    def chunks(self, token_budget=None, positions=None):
+        """
+        Split the rendered tree into blocks of at most ``token_budget`` tokens.
+
+        Blocks break between Category2 groups, repeating the Category1 line; a
+        group too large on its own is split between leaves.
+        """
+        text = self.render(positions)
+        if not token_budget or estimate_tokens(text) <= token_budget:
+            return [text]
+
+        blocks = []
+        current = []
+        current_tokens = 0
+        current_header = None
+        category1 = None
+
+        for line in (self._full if positions is None else self.render_lines(positions)):
+            if not line.startswith(" "):
+                category1 = line
+                continue
+
+            header_tokens = estimate_tokens(category1)
+            for piece in self._split_group(line, token_budget - header_tokens):
+                piece_tokens = estimate_tokens(piece)
+                needs_header = current_header != category1
+                if current and current_tokens + piece_tokens + (header_tokens if needs_header else 0) > token_budget:
+                    blocks.append("\n".join(current))
+                    current, current_tokens = [], 0
+                    needs_header = True
+                if needs_header:
+                    current.append(category1)
+                    current_tokens += header_tokens
+                    current_header = category1
+                current.append(piece)
+                current_tokens += piece_tokens
+        if current:
+            blocks.append("\n".join(current))
+        return blocks
+
+    @staticmethod
+    def _split_group(line, token_budget):
+        """Split one " Category2: leaf; leaf" line into lines within the budget"""
+        if estimate_tokens(line) <= token_budget:
+            return [line]
+        prefix, leaves = line.split(": ", 1)
+        pieces = []
+        current = []
+        for leaf in leaves.split("; "):
+            candidate = f"{prefix}: " + "; ".join(current + [leaf])
+            if current and estimate_tokens(candidate) > token_budget:
+                pieces.append(f"{prefix}: " + "; ".join(current))
+                current = []
+            current.append(leaf)
+        pieces.append(f"{prefix}: " + "; ".join(current))
+        return pieces
@@ -0,0 +1,97 @@
+import sqlite3
+
+
+class CategoryRegistry:
+    def __init__(self, path="category_registry.sqlite3"):
+        """
+        Persistent (Category1, Category2, Category3) -> CategoryId mapping.
+
+        IDs are only ever appended: a category keeps its ID across runs, new
+        categories get the next free ID, and a category that disappears keeps
+        its ID (and gets it back if it returns). Each run records which
+        categories it saw, so ``finish`` can report what was added and removed.
+
+        :param path: SQLite file holding the registry (":memory:" for a throwaway one)
+        """
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS categories (
+                category_id INTEGER PRIMARY KEY,
+                category1 TEXT NOT NULL,
+                category2 TEXT NOT NULL,
+                category3 TEXT NOT NULL,
+                active INTEGER NOT NULL DEFAULT 1,
+                UNIQUE (category1, category2, category3)
+            )
+            """
+        )
+        self._db.commit()
+
+        # key -> (id, active before this run); missing levels are stored as ""
+        self._known = {
+            (category1, category2, category3): (category_id, bool(active))
+            for category_id, category1, category2, category3, active in self._db.execute(
+                "SELECT category_id, category1, category2, category3, active FROM categories"
+            )
+        }
+        self._next_id = max((category_id for category_id, _ in self._known.values()), default=0) + 1
+        self._seen = set()
+
+    @staticmethod
+    def _key(key):
+        return tuple("" if value is None else str(value) for value in key)
+
+    def id_for(self, key):
+        """
+        :param key: (Category1, Category2, Category3); None for a missing level
+        :return: The category's ID, registering it if it is new
+        """
+        key = self._key(key)
+        known = self._known.get(key)
+        if known is None:
+            known = (self._next_id, False)
+            self._known[key] = known
+            self._next_id += 1
+            # Inactive until finish(): if this run dies first, the next run still reports it as added
+            self._db.execute("INSERT INTO categories VALUES (?, ?, ?, ?, 0)", (known[0],) + key)
+        self._seen.add(key)
+        return known[0]
+
+    def finish(self):
+        """
+        Mark the categories seen this run as active and the rest as removed.
+
+        :return: (added, removed), each a list of (CategoryId, (Category1, Category2, Category3))
+            sorted by ID; "added" includes categories that came back after being removed
+        """
+        added = []
+        removed = []
+        for key, (category_id, was_active) in self._known.items():
+            if key in self._seen and not was_active:
+                added.append((category_id, key))
+            elif key not in self._seen and was_active:
+                removed.append((category_id, key))
+
+        with self._db:
+            self._db.execute("UPDATE categories SET active = 0")
+            self._db.executemany(
+                "UPDATE categories SET active = 1 WHERE category1 = ? AND category2 = ? AND category3 = ?",
+                list(self._seen)
+            )
+        for key, (category_id, _) in self._known.items():
+            self._known[key] = (category_id, key in self._seen)
+        return sorted(added), sorted(removed)
+
+    def active(self):
+        """
+        :return: List of (CategoryId, (Category1, Category2, Category3)) of active categories, by ID
+        """
+        return sorted(
+            (category_id, key) for key, (category_id, active) in self._known.items() if active
+        )
+
+    def close(self):
+        self._db.commit()
+        self._db.close()
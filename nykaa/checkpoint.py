@@ -0,0 +1,58 @@
+import os
+import sqlite3
+import threading
+
+
+class CrawlCheckpoint:
+    def __init__(self, path="nykaa_checkpoint.sqlite3"):
+        """
+        Durable journal of finished crawl work, so a restarted run can skip
+        product types that were already written out.
+
+        :param path: SQLite file holding the journal
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS completed_tasks (task_key TEXT PRIMARY KEY)")
+        self._db.commit()
+
+        self._completed = {row[0] for row in self._db.execute("SELECT task_key FROM completed_tasks")}
+
+    @property
+    def resuming(self):
+        """
+        :return: True if the journal already holds work from an earlier run
+        """
+        return bool(self._completed)
+
+    def is_done(self, task_key):
+        with self._lock:
+            return task_key in self._completed
+
+    def record(self, task_key):
+        """
+        Mark a task as finished. Call only once its rows are safely on disk.
+
+        :param task_key: Finished task (product-type link)
+        """
+        with self._lock:
+            with self._db:
+                self._db.execute("INSERT OR IGNORE INTO completed_tasks VALUES (?)", (task_key,))
+            self._completed.add(task_key)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def finish(self):
+        """
+        Close and delete the journal after a complete run, so the next run starts fresh.
+        """
+        self.close()
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                os.remove(self.path + suffix)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,140 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from urllib.parse import urlparse
+
+
+def normalize_link(link):
+    """
+    Cache key for a product link: the lower-cased path without host, query,
+    fragment or trailing slash, so tracking parameters don't split entries.
+
+    :param link: Relative or absolute product URL
+    :return: Normalized key
+    """
+    path = urlparse(link.strip()).path
+    return path.rstrip("/").lower() or "/"
+
+
+class DetailCache:
+    def __init__(self, max_entries=10000, path=None, ttl=24 * 3600):
+        """
+        Product-detail results keyed on the normalized product link.
+
+        Lookups go to an in-memory LRU first, then to the optional SQLite
+        tier. Concurrent requests for the same link are coalesced: the first
+        caller loads it and the others wait for that result instead of
+        loading it again. Empty results (failed loads) are not cached.
+
+        :param max_entries: Entries kept in memory
+        :param path: SQLite file for the persistent tier (None keeps the cache in memory only)
+        :param ttl: Seconds a persisted entry stays valid
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._inflight = {}
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "coalesced": 0, "misses": 0}
+
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS details (key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)"
+            )
+            self._db.execute("DELETE FROM details WHERE stored_at < ?", (time.time() - ttl,))
+            self._db.commit()
+
+    def _remember(self, key, value):
+        # Caller holds the lock
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _load_persisted(self, key):
+        with self._lock:
+            row = self._db.execute("SELECT value, stored_at FROM details WHERE key = ?", (key,)).fetchone()
+        if row is None or time.time() - row[1] > self.ttl:
+            return None
+        return json.loads(row[0])
+
+    def _persist(self, key, value):
+        with self._lock:
+            with self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO details VALUES (?, ?, ?)", (key, json.dumps(value), time.time())
+                )
+
+    def get_or_load(self, link, load):
+        """
+        Return the cached details for ``link``, or call ``load(link)`` once
+        and share its result with every concurrent caller.
+
+        :param link: Product link as found on the listing
+        :param load: Callable(link) -> details dict ({} on failure)
+        :return: Details dict
+        """
+        key = normalize_link(link)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return self._memory[key]
+            future = self._inflight.get(key)
+            if future is not None:
+                # Someone else is loading it; wait for their result
+                self._stats["coalesced"] += 1
+                waiting = True
+            else:
+                future = self._inflight[key] = Future()
+                waiting = False
+        if waiting:
+            return future.result()
+
+        try:
+            value = self._load_persisted(key) if self._db else None
+            if value is not None:
+                stat = "disk_hits"
+            else:
+                stat = "misses"
+                value = load(link)
+                if value and self._db:
+                    self._persist(key, value)
+            with self._lock:
+                self._stats[stat] += 1
+                if value:
+                    self._remember(key, value)
+            future.set_result(value)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+        return value
+
+    def stats(self):
+        """
+        :return: {"memory_hits", "disk_hits", "coalesced", "misses"} counts
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def print_stats(self):
+        stats = self.stats()
+        lookups = sum(stats.values())
+        hits = lookups - stats["misses"]
+        print(f"Detail cache: {hits}/{lookups} served without a fetch "
+              f"(memory={stats['memory_hits']}, disk={stats['disk_hits']}, "
+              f"coalesced={stats['coalesced']}, fetched={stats['misses']})")
+
+    def close(self):
+        if self._db:
+            with self._lock:
+                self._db.close()
@@ -1,39 +1,158 @@
+import os
 import pandas as pd
 
-# Load the original CSV file
-input_file = 'nykaa_categories.csv'  # Replace with the actual file name
-df = pd.read_csv(input_file)
+from category_registry import CategoryRegistry
 
-# Create a unique combination of category, subcategory, and product type
-unique_categories = df[['Category', 'Subcategory', 'Product Type']].drop_duplicates().reset_index(drop=True)
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
 
-# Add a unique category ID
-unique_categories['CategoryId'] = range(1, len(unique_categories) + 1)
+CATEGORY_COLUMNS = ['Category', 'Subcategory', 'Product Type']
 
-# Save the unique categories to a new CSV file
-unique_categories_csv = 'unique_categories.csv'
-unique_categories.rename(columns={
-    'Category': 'Category1',
-    'Subcategory': 'Category2',
-    'Product Type': 'Category3'
-}, inplace=True)
-unique_categories = unique_categories[['CategoryId', 'Category1', 'Category2', 'Category3']]
-unique_categories.to_csv(unique_categories_csv, index=False)
 
-# Merge the original data with the unique categories to get the CategoryId
-merged_df = df.merge(unique_categories, left_on=['Category', 'Subcategory', 'Product Type'], 
-                     right_on=['Category1', 'Category2', 'Category3'])
+def read_chunks(input_file, chunksize):
+    """
+    Yield the scraped rows in chunks, category columns as categoricals and
+    everything else as strings, so only one chunk is ever held in memory.
 
-# Drop the original category columns and keep the rest
-final_data = merged_df.drop(columns=['Category', 'Subcategory', 'Product Type', 'Category1', 'Category2', 'Category3'])
+    :param input_file: nykaa_categories.csv or .parquet as written by app.py
+    :param chunksize: Rows per chunk
+    """
+    if input_file.endswith(".parquet"):
+        if pq is None:
+            raise ImportError("pyarrow is required for parquet input (pip install pyarrow)")
+        for batch in pq.ParquetFile(input_file).iter_batches(batch_size=chunksize):
+            chunk = batch.to_pandas()
+            yield chunk.astype({column: "category" for column in CATEGORY_COLUMNS})
+        return
 
-# Reorder columns to make CategoryId the first column
-columns = ['CategoryId'] + [col for col in final_data.columns if col != 'CategoryId']
-final_data = final_data[columns]
+    header = pd.read_csv(input_file, nrows=0).columns
+    dtype = {column: ("category" if column in CATEGORY_COLUMNS else str) for column in header}
+    yield from pd.read_csv(input_file, dtype=dtype, chunksize=chunksize)
 
-# Save the final data to another CSV file
-final_data_csv = 'final_data.csv'
-final_data.to_csv(final_data_csv, index=False)
 
-print(f"Unique categories saved to {unique_categories_csv}")
-print(f"Final data saved to {final_data_csv}")
\ No newline at end of file
+class ChunkWriter:
+    def __init__(self, path, output_format="csv"):
+        """
+        Append DataFrame chunks to one CSV file or one Parquet file (a row group per chunk).
+
+        :param path: Output file
+        :param output_format: "csv" or "parquet" (parquet requires pyarrow)
+        """
+        if output_format == "parquet" and pa is None:
+            raise ImportError("pyarrow is required for parquet output (pip install pyarrow)")
+        self.path = path
+        self.output_format = output_format
+        self.rows = 0
+        self._parquet_writer = None
+
+    def write(self, chunk):
+        if self.output_format == "parquet":
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.path, table.schema)
+            self._parquet_writer.write_table(table.cast(self._parquet_writer.schema))
+        else:
+            chunk.to_csv(self.path, mode="w" if self.rows == 0 else "a", header=self.rows == 0, index=False)
+        self.rows += len(chunk)
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+
+def _category_key(values):
+    # NaN != NaN, so missing levels are keyed as None
+    return tuple(None if pd.isna(value) else value for value in values)
+
+
+def _categories_frame(categories, extra=None):
+    rows = [(category_id,) + key for category_id, key in categories]
+    frame = pd.DataFrame(rows, columns=['CategoryId', 'Category1', 'Category2', 'Category3'])
+    if extra:
+        frame = frame.assign(**extra)
+    return frame
+
+
+def extract(input_file, unique_categories_csv, final_data_path, chunksize=100000, output_format="csv",
+            registry=None, delta_csv=None):
+    """
+    Assign a CategoryId to every (Category, Subcategory, Product Type) and
+    write the products with that ID in place of the three columns.
+
+    IDs come from the registry, which is looked up once per distinct
+    combination in each chunk, so memory stays flat however many products
+    were scraped. With a persistent registry, existing categories keep
+    their IDs across runs and new ones are appended; without one, IDs
+    follow the order each combination is first seen.
+
+    :param input_file: Scraped products (CSV or Parquet)
+    :param unique_categories_csv: Output CSV of CategoryId, Category1, Category2, Category3
+    :param final_data_path: Output of CategoryId plus the product columns
+    :param chunksize: Rows read and written per chunk
+    :param output_format: "csv" or "parquet" for final_data_path
+    :param registry: CategoryRegistry to take IDs from (None numbers categories from 1)
+    :param delta_csv: Optional output CSV of categories added/removed since the registry's last run
+    :return: (rows written, added categories, removed categories)
+    """
+    registry = registry or CategoryRegistry(":memory:")
+    writer = ChunkWriter(final_data_path, output_format)
+    try:
+        for chunk in read_chunks(input_file, chunksize):
+            # Only this chunk's distinct combinations are looked up, not every row
+            combinations = chunk[CATEGORY_COLUMNS].drop_duplicates()
+            combinations = combinations.assign(CategoryId=[
+                registry.id_for(_category_key(values))
+                for values in combinations.itertuples(index=False)
+            ])
+
+            final_data = chunk.merge(combinations, on=CATEGORY_COLUMNS, how='left', sort=False)
+            final_data = final_data.drop(columns=CATEGORY_COLUMNS)
+
+            # Reorder columns to make CategoryId the first column
+            columns = ['CategoryId'] + [col for col in final_data.columns if col != 'CategoryId']
+            writer.write(final_data[columns])
+    finally:
+        writer.close()
+
+    added, removed = registry.finish()
+    _categories_frame(registry.active()).to_csv(unique_categories_csv, index=False)
+    if delta_csv:
+        pd.concat([
+            _categories_frame(added, {'Change': 'added'}),
+            _categories_frame(removed, {'Change': 'removed'})
+        ]).to_csv(delta_csv, index=False)
+    return writer.rows, added, removed
+
+
+if __name__ == "__main__":
+    input_file = 'nykaa_categories.csv'  # Replace with the actual file name
+    unique_categories_csv = 'unique_categories.csv'
+    # Categories added/removed since the last extract run
+    category_delta_csv = 'category_delta.csv'
+
+    # Rows per chunk, and "parquet" to write final_data.parquet instead of CSV
+    CHUNKSIZE = int(os.getenv("EXTRACT_CHUNKSIZE", "100000"))
+    OUTPUT_FORMAT = os.getenv("EXTRACT_OUTPUT_FORMAT", "csv")
+    final_data_file = f'final_data.{OUTPUT_FORMAT}'
+    # Keeps CategoryIds stable across runs; delete it to renumber from 1
+    REGISTRY_FILE = os.getenv("CATEGORY_REGISTRY", "category_registry.sqlite3")
+
+    registry = CategoryRegistry(REGISTRY_FILE)
+    try:
+        rows, added, removed = extract(
+            input_file, unique_categories_csv, final_data_file,
+            chunksize=CHUNKSIZE,
+            output_format=OUTPUT_FORMAT,
+            registry=registry,
+            delta_csv=category_delta_csv
+        )
+    finally:
+        registry.close()
+
+    print(f"Unique categories saved to {unique_categories_csv}")
+    print(f"Category changes saved to {category_delta_csv} ({len(added)} added, {len(removed)} removed)")
+    print(f"Final data saved to {final_data_file} ({rows} rows)")
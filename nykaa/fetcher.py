@@ -0,0 +1,130 @@
+import re
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+
+
+def url_pattern(url):
+    """
+    Collapse a URL into a coarse pattern for stats, e.g.
+    ``/makeup/face/foundation/c/228`` -> ``/c/:id`` and ``/`` for the home page.
+
+    :param url: Absolute or relative URL
+    :return: Pattern string
+    """
+    segments = [s for s in urlparse(url).path.split("/") if s]
+    if not segments:
+        return "/"
+    for i, segment in enumerate(segments):
+        if re.fullmatch(r"\d+", segment):
+            prefix = segments[i - 1] if i > 0 else ""
+            return f"/{prefix}/:id" if prefix else "/:id"
+    return f"/{segments[0]}/*"
+
+
+class FetchStrategy:
+    def __init__(self, browser_get, headers=None, pool_size=10, timeout=15, cache=None, metrics=None):
+        """
+        HTTP-first page fetcher that only falls back to a real browser when
+        the server-rendered HTML lacks the content the caller needs.
+
+        :param browser_get: Callable(url, kind) -> rendered HTML or None, used as the fallback
+        :param headers: Default headers for the HTTP session
+        :param pool_size: Keep-alive connections kept per host
+        :param timeout: HTTP request timeout in seconds
+        :param cache: Optional common.http_cache.HttpCache for conditional GETs
+        :param metrics: Optional common.metrics.Metrics for fetch timings and page counts
+        """
+        self.browser_get = browser_get
+        self.timeout = timeout
+        self.cache = cache
+        self.metrics = metrics
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=1)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if headers:
+            self.session.headers.update(headers)
+
+        self._stats = defaultdict(lambda: {"http": 0, "browser": 0, "failed": 0})
+        self._stats_lock = threading.Lock()
+
+    def _record(self, url, kind, path):
+        with self._stats_lock:
+            self._stats[url_pattern(url)][path] += 1
+        if self.metrics:
+            self.metrics.pages(kind, path).inc()
+
+    def _download(self, url):
+        """
+        GET a URL over the pooled session, revalidating against the cache
+        when one is configured.
+
+        :return: Response body bytes, or None on failure
+        """
+        headers = self.cache.conditional_headers(url) if self.cache else {}
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+            if response.status_code == 304 and self.cache:
+                body = self.cache.revalidated(url)
+                if body is not None:
+                    return body
+                # Cached body vanished; fetch it again in full
+                response = self.session.get(url, timeout=self.timeout)
+        except requests.RequestException as e:
+            print(f"HTTP fetch failed for {url}: {e}")
+            return None
+        if response.status_code != 200:
+            return None
+
+        if self.cache:
+            self.cache.store(url, response.content, response.headers)
+        return response.content
+
+    def fetch(self, url, extract, kind="page"):
+        """
+        Fetch raw markup and turn it into records, escalating to the browser
+        only when the server-rendered HTML lacks what ``extract`` needs.
+        Parsing is left to ``extract`` (e.g. a ParseStage process pool).
+
+        :param url: URL to fetch
+        :param extract: Callable(markup, required) -> records, or None when ``required``
+            and the markup lacks the content needed
+        :param kind: Page kind (home, listing, detail, ...) used to label metrics
+        :return: Records, or None if the page could not be loaded
+        """
+        start = time.perf_counter()
+        content = self._download(url)
+        if self.metrics:
+            self.metrics.stage(kind, "fetch").observe(time.perf_counter() - start)
+        if content is not None:
+            records = extract(content, True)
+            if records is not None:
+                self._record(url, kind, "http")
+                return records
+
+        html = self.browser_get(url, kind)
+        self._record(url, kind, "browser" if html is not None else "failed")
+        return extract(html, False) if html is not None else None
+
+    def stats(self):
+        """
+        :return: {pattern: {"http": n, "browser": n, "failed": n}}
+        """
+        with self._stats_lock:
+            return {pattern: dict(counts) for pattern, counts in self._stats.items()}
+
+    def print_stats(self):
+        for pattern, counts in sorted(self.stats().items()):
+            total = sum(counts.values())
+            print(f"{pattern}: {total} pages "
+                  f"(http={counts['http']}, browser={counts['browser']}, failed={counts['failed']})")
+
+    def close(self):
+        self.session.close()
+        if self.cache:
+            self.cache.close()
@@ -0,0 +1,137 @@
+import time
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from specs import READY_SELECTORS
+
+# URL suffixes per resource type, blocked through DevTools
+RESOURCE_EXTENSIONS = {
+    "image": ("png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico"),
+    "font": ("woff", "woff2", "ttf", "otf", "eot"),
+    "stylesheet": ("css",),
+    "media": ("mp4", "webm", "m3u8", "mp3"),
+}
+
+# Analytics, ads and tag managers that never carry page content
+TRACKER_DOMAINS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "facebook.net",
+    "connect.facebook.net",
+    "hotjar.com",
+    "clarity.ms",
+    "criteo.com",
+    "branch.io",
+    "moengage.com",
+    "webengage.com",
+)
+
+_READY_STATE_SCRIPT = """
+return [
+    !!document.querySelector(arguments[0]),
+    !!(arguments[1] && document.querySelector(arguments[1])),
+    document.readyState
+];
+"""
+
+
+class PageLoadProfile:
+    def __init__(self, block_resources=("image", "font", "stylesheet", "media"), block_domains=TRACKER_DOMAINS,
+                 page_load_strategy="eager", ready_selectors=None, fail_selectors=None, ready_timeout=10,
+                 settle_timeout=2.0, page_load_timeout=30):
+        """
+        How headless Chrome loads pages: which requests are blocked, when
+        navigation returns, and what "ready" means for each page kind.
+
+        A page is ready once its kind's selector is present. It fails fast
+        when a fail selector appears, or when the document has finished
+        loading and the selector still hasn't shown up ``settle_timeout``
+        seconds later; ``ready_timeout`` caps the wait either way.
+
+        :param block_resources: Resource types to block, keys of RESOURCE_EXTENSIONS
+        :param block_domains: Third-party domains to block
+        :param page_load_strategy: "normal", "eager" (return at DOMContentLoaded) or "none"
+        :param ready_selectors: {page kind: CSS selector}, merged over READY_SELECTORS
+        :param fail_selectors: {page kind: CSS selector} marking a page that will never be ready
+        :param ready_timeout: Maximum seconds to wait for the ready selector
+        :param settle_timeout: Seconds after the document finished loading before giving up
+        :param page_load_timeout: Seconds before a navigation itself times out
+        """
+        self.block_resources = tuple(block_resources)
+        self.block_domains = tuple(block_domains)
+        self.page_load_strategy = page_load_strategy
+        self.ready_selectors = dict(READY_SELECTORS, **(ready_selectors or {}))
+        self.fail_selectors = fail_selectors or {}
+        self.ready_timeout = ready_timeout
+        self.settle_timeout = settle_timeout
+        self.page_load_timeout = page_load_timeout
+
+    def apply(self, options):
+        """
+        Set the page-load strategy and content-setting prefs on ChromeOptions.
+        """
+        options.page_load_strategy = self.page_load_strategy
+        if "image" in self.block_resources:
+            options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        return options
+
+    def blocked_url_patterns(self):
+        """
+        :return: URL patterns for DevTools Network.setBlockedURLs
+        """
+        patterns = []
+        for resource in self.block_resources:
+            for extension in RESOURCE_EXTENSIONS.get(resource, ()):
+                patterns += [f"*.{extension}", f"*.{extension}?*"]
+        patterns += [f"*{domain}*" for domain in self.block_domains]
+        return patterns
+
+    def prepare(self, driver):
+        """
+        Install request blocking on a new driver.
+
+        :return: The same driver
+        """
+        driver.set_page_load_timeout(self.page_load_timeout)
+        patterns = self.blocked_url_patterns()
+        if patterns:
+            try:
+                driver.execute_cdp_cmd("Network.enable", {})
+                driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+            except Exception as e:
+                # Non-Chromium drivers have no DevTools; pages just load in full
+                print(f"Request blocking unavailable: {e}")
+        return driver
+
+    def wait_ready(self, driver, kind):
+        """
+        Wait until the page kind's ready selector is present.
+
+        :param driver: WebDriver that has just navigated
+        :param kind: Page kind (home, listing, detail, ...); unknown kinds wait for body
+        :return: True if ready, False on a fail selector, settle timeout or ready timeout
+        """
+        ready_selector = self.ready_selectors.get(kind, "body")
+        fail_selector = self.fail_selectors.get(kind)
+        loaded_at = None
+
+        def check(driver):
+            nonlocal loaded_at
+            # One round trip per poll
+            ready, failed, ready_state = driver.execute_script(_READY_STATE_SCRIPT, ready_selector, fail_selector)
+            if ready:
+                return "ready"
+            if failed:
+                return "failed"
+            if ready_state == "complete":
+                loaded_at = loaded_at or time.monotonic()
+                if time.monotonic() - loaded_at >= self.settle_timeout:
+                    return "failed"
+            return False
+
+        try:
+            return WebDriverWait(driver, self.ready_timeout, poll_frequency=0.1).until(check) == "ready"
+        except TimeoutException:
+            return False
@@ -0,0 +1,145 @@
+import concurrent.futures
+import multiprocessing
+import threading
+import time
+
+from common import html_parser
+import specs
+
+# Listing pages only need the product cards parsed
+LISTING_ONLY = html_parser.Only(attrs={"class": "productWrapper"})
+
+
+# Record builders. They run in the parse processes, so they take raw markup
+# and return plain picklable data, with the seconds spent parsing and
+# extracting; None records mean the page lacks the content the caller needs
+# (so the fetcher should try the browser).
+
+def product_type_tasks(home_page):
+    """
+    Walk the MegaDropdown menu on the home page.
+
+    :param home_page: Parsed home page
+    :return: Generator of (category, subcategory, product type, product type link)
+    """
+    for category_section in home_page.select(".MegaDropdownHeadingbox"):
+        category_link_tag = category_section.find("a")
+        if not category_link_tag:
+            continue
+        category_name = category_link_tag.text.strip()
+
+        for subcategory in category_section.select(".MegaDropdown-ContentInner .MegaDropdown-ContentHeading"):
+            subcategory_link_tag = subcategory.find("a")
+            if not subcategory_link_tag:
+                continue
+            subcategory_name = subcategory_link_tag.text.strip()
+
+            product_list = subcategory.find_next_sibling("ul")
+            if not product_list:
+                continue
+
+            for product_type in product_list.select("li a"):
+                product_type_name = product_type.text.strip()
+                product_type_link = product_type.get("href", "")
+                yield category_name, subcategory_name, product_type_name, product_type_link
+
+
+def _build(markup, parser, only, ready_selector, extract):
+    """
+    Parse markup, check it has ``ready_selector`` (if any) and extract its records.
+
+    :return: (records or None, (parse seconds, extract seconds))
+    """
+    start = time.perf_counter()
+    page = html_parser.parse(markup, parser, only)
+    parsed = time.perf_counter()
+    if ready_selector and not page.select_one(ready_selector):
+        return None, (parsed - start, 0.0)
+    records = extract(page)
+    return records, (parsed - start, time.perf_counter() - parsed)
+
+
+def home_records(markup, parser=None, required=True):
+    """
+    :return: (List of product-type tasks from the home page menu, timings)
+    """
+    return _build(markup, parser, None, required and specs.READY_SELECTORS["home"],
+                  lambda home_page: list(product_type_tasks(home_page)))
+
+
+def listing_records(markup, parser=None, required=True):
+    """
+    :return: (List of PRODUCT_CARD dicts in listing order, timings)
+    """
+    return _build(markup, parser, LISTING_ONLY, required and specs.READY_SELECTORS["listing"],
+                  lambda product_page: [
+                      specs.PRODUCT_CARD.extract(product) for product in product_page.select(".productWrapper a")
+                  ])
+
+
+def detail_records(markup, parser=None, required=True):
+    """
+    :return: (PRODUCT_DETAIL dict for a product page, timings)
+    """
+    return _build(markup, parser, None, required and specs.READY_SELECTORS["detail"], specs.PRODUCT_DETAIL.extract)
+
+
+class ParseStage:
+    def __init__(self, workers=None, max_pending=None, metrics=None):
+        """
+        CPU stage of the crawl: parses raw HTML into records in a pool of
+        processes, so I/O threads only fetch and parsing isn't bound to one
+        core by the GIL.
+
+        At most ``max_pending`` pages are queued or being parsed; further
+        callers block until a slot frees up, so a burst of downloads can't
+        pile raw HTML up in memory.
+
+        :param workers: Parse processes (0 parses inline in the calling thread; None uses every
+            core, or inline on a single-core machine where processes would only add overhead)
+        :param max_pending: Pages queued or in progress before callers wait (defaults to 2 per process)
+        :param metrics: Optional common.metrics.Metrics; records "parse", "extract" and "parse_wait" stage timings
+        """
+        if workers is None:
+            workers = multiprocessing.cpu_count()
+            workers = workers if workers > 1 else 0
+        self.workers = workers
+        self.metrics = metrics
+        self._executor = None
+        self._slots = None
+        if self.workers:
+            # spawn, not fork: the crawl is multi-threaded by the time the pool starts
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            self._slots = threading.BoundedSemaphore(max_pending or 2 * self.workers)
+
+    def run(self, func, *args, kind="page"):
+        """
+        Run a record builder on the pool and wait for its records.
+
+        :param func: Module-level record builder, e.g. listing_records
+        :param args: Its arguments (markup first)
+        :param kind: Page kind used to label metrics
+        """
+        start = time.perf_counter()
+        if self._executor is None:
+            records, (parse_seconds, extract_seconds) = func(*args)
+        else:
+            self._slots.acquire()
+            try:
+                records, (parse_seconds, extract_seconds) = self._executor.submit(func, *args).result()
+            finally:
+                self._slots.release()
+        if self.metrics:
+            self.metrics.stage(kind, "parse").observe(parse_seconds)
+            self.metrics.stage(kind, "extract").observe(extract_seconds)
+            self.metrics.stage(kind, "parse_wait").observe(
+                time.perf_counter() - start - parse_seconds - extract_seconds
+            )
+        return records
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
@@ -0,0 +1,137 @@
+import os
+import re
+import zlib
+import numpy as np
+import pandas as pd
+
+
+class CategoryPrefilter:
+    """Local retrieval stage that ranks categories for each campaign.
+
+    Campaigns and categories (Category1/2/3) are turned into hashed TF-IDF
+    vectors of words and character n-grams, and every campaign is scored
+    against every category with one matrix product. The top-K categories
+    can then be sent to the LLM, or thresholds can label matches locally.
+    """
+
+    def __init__(self, categories_df, n_features=2 ** 13, ngram_sizes=(3, 4), chunk_size=512):
+        self.n_features = n_features
+        self.ngram_sizes = ngram_sizes
+        self.chunk_size = chunk_size
+        self.category_ids = [str(cat_id) for cat_id in categories_df['CategoryId']]
+
+        texts = [
+            " ".join(str(cat) for cat in row if not pd.isna(cat))
+            for row in categories_df[['Category1', 'Category2', 'Category3']].itertuples(index=False)
+        ]
+        counts = self._counts(texts)
+
+        # Smoothed IDF learned from the category names
+        document_frequency = (counts > 0).sum(axis=0)
+        self.idf = (np.log((1 + len(texts)) / (1 + document_frequency)) + 1).astype(np.float32)
+        self.category_matrix = self._normalize(self._weight(counts))
+
+    def _features(self, text):
+        """Hashed feature indices: whole words plus character n-grams of each word"""
+        indices = []
+        for word in re.findall(r"[a-z0-9]+", str(text).lower()):
+            indices.append(zlib.crc32(b"w:" + word.encode("utf-8")) % self.n_features)
+            padded = f"<{word}>"
+            for n in self.ngram_sizes:
+                for i in range(len(padded) - n + 1):
+                    indices.append(zlib.crc32(padded[i:i + n].encode("utf-8")) % self.n_features)
+        return indices
+
+    def _counts(self, texts):
+        counts = np.zeros((len(texts), self.n_features), dtype=np.float32)
+        for row, text in enumerate(texts):
+            np.add.at(counts[row], self._features(text), 1)
+        return counts
+
+    def _weight(self, counts):
+        # Sublinear term frequency, then IDF
+        return np.log1p(counts) * self.idf
+
+    @staticmethod
+    def _normalize(matrix):
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.maximum(norms, 1e-12)
+
+    def scores(self, campaign_texts):
+        """Cosine similarity of every campaign to every category, shape (campaigns, categories)"""
+        result = np.empty((len(campaign_texts), len(self.category_ids)), dtype=np.float32)
+        # Vectorise campaigns in chunks so memory stays bounded for large inputs
+        for start in range(0, len(campaign_texts), self.chunk_size):
+            chunk = campaign_texts[start:start + self.chunk_size]
+            vectors = self._normalize(self._weight(self._counts(chunk)))
+            result[start:start + len(chunk)] = vectors @ self.category_matrix.T
+        return result
+
+    def top_k(self, campaign_texts, k):
+        """Row positions of the k best categories per campaign, best first"""
+        scores = self.scores(campaign_texts)
+        k = min(k, scores.shape[1])
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        order = np.take_along_axis(scores, top, axis=1).argsort(axis=1)[:, ::-1]
+        return np.take_along_axis(top, order, axis=1)
+
+    def recall(self, campaign_texts, expected, k):
+        """Share of known matches the top-k cut keeps: (kept, total), where
+        expected holds one set of matching category ids per campaign"""
+        kept = total = 0
+        for positions, categories in zip(self.top_k(campaign_texts, k), expected):
+            candidates = {self.category_ids[position] for position in positions}
+            kept += len(categories & candidates)
+            total += len(categories)
+        return kept, total
+
+    def local_matches(self, campaign_texts, strong_threshold=0.35, medium_threshold=0.2):
+        """Label matches without an LLM: score >= strong is 'strong', >= medium is 'medium'"""
+        scores = self.scores(campaign_texts)
+        results = []
+        for row in scores:
+            matches = []
+            for position in np.flatnonzero(row >= medium_threshold)[np.argsort(-row[row >= medium_threshold])]:
+                matches.append({
+                    "categoryId": self.category_ids[position],
+                    "match": "strong" if row[position] >= strong_threshold else "medium"
+                })
+            results.append(matches)
+        return results
+
+
+if __name__ == "__main__":
+    # Recall check against an earlier (LLM) output: how many of its matches
+    # survive the top-K cut, and how the labeled matches score, to choose
+    # MATCH_TOP_K and the MATCH_LOCAL_ONLY thresholds from measurements
+    campaigns_df = pd.read_csv(os.getenv("MATCH_CAMPAIGN_FILE", "campaigns.csv"))
+    categories_df = pd.read_csv(os.getenv("MATCH_CATEGORY_FILE", "categories.csv"))
+    matches_df = pd.read_csv(os.getenv("MATCH_OUTPUT_FILE", "campaign_category_matches.csv"), dtype=str)
+
+    prefilter = CategoryPrefilter(categories_df)
+    campaign_ids = campaigns_df['campaignId'].astype(str).tolist()
+    campaign_texts = campaigns_df['campaignText'].astype(str).tolist()
+    expected = {label: [
+        set(matches_df.loc[(matches_df['campaignId'] == campaign_id) & matches_df['match'].isin(labels), 'categoryId'])
+        for campaign_id in campaign_ids
+    ] for label, labels in (("all", ("strong", "medium")), ("strong", ("strong",)))}
+
+    for k in (10, 20, 50, 100, 150, len(prefilter.category_ids)):
+        kept, total = prefilter.recall(campaign_texts, expected["all"], k)
+        strong_kept, strong_total = prefilter.recall(campaign_texts, expected["strong"], k)
+        print(f"top-{k}: keeps {kept}/{total} matches, {strong_kept}/{strong_total} strong")
+
+    scores = prefilter.scores(campaign_texts)
+    positions = {category_id: position for position, category_id in enumerate(prefilter.category_ids)}
+    print(f"Best score per campaign: {', '.join(f'{score:.3f}' for score in scores.max(axis=1))}")
+    for label in ("strong", "medium"):
+        labeled = [
+            scores[row, positions[category_id]]
+            for row, campaign_id in enumerate(campaign_ids)
+            for category_id in matches_df.loc[(matches_df['campaignId'] == campaign_id)
+                                              & (matches_df['match'] == label), 'categoryId']
+            if category_id in positions
+        ]
+        if labeled:
+            quartiles = np.percentile(labeled, [25, 50, 75])
+            print(f"{label} matches score {', '.join(f'{q:.3f}' for q in quartiles)} (quartiles)")
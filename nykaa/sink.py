@@ -0,0 +1,156 @@
+import csv
+import os
+import queue
+import threading
+import time
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+_STOP = object()
+
+
+class RowSink:
+    def __init__(self, path, header, fmt="csv", batch_size=500, flush_interval=2.0, max_queue=10000, append=False,
+                 metrics=None):
+        """
+        Single-writer output sink. Scraper threads hand rows to a bounded
+        queue and a dedicated writer thread batches them to disk, flushing
+        once ``batch_size`` rows are buffered or ``flush_interval`` seconds
+        have passed.
+
+        :param path: Output file path
+        :param header: Column names
+        :param fmt: "csv" or "parquet" (parquet requires pyarrow)
+        :param batch_size: Rows buffered before a flush
+        :param flush_interval: Maximum seconds between flushes
+        :param max_queue: Maximum pending row batches before producers wait
+        :param append: Append to an existing CSV instead of truncating it
+        :param metrics: Optional common.metrics.Metrics to record write timings and row counts
+        """
+        if fmt not in ("csv", "parquet"):
+            raise ValueError(f"Unsupported output format: {fmt}")
+        if fmt == "parquet" and pa is None:
+            raise ImportError("pyarrow is required for parquet output (pip install pyarrow)")
+        if fmt == "parquet" and append:
+            raise ValueError("Appending is only supported for CSV output")
+
+        self.path = path
+        self.header = list(header)
+        self.fmt = fmt
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.append = append
+        self.metrics = metrics
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._buffer = []
+        self._callbacks = []
+        self._file = None
+        self._csv_writer = None
+        self._parquet_writer = None
+        self._error = None
+        self.rows_written = 0
+
+        self._open()
+        self._thread = threading.Thread(target=self._run, name="row-sink", daemon=True)
+        self._thread.start()
+
+    def _open(self):
+        if self.fmt == "csv":
+            resume = self.append and os.path.exists(self.path) and os.path.getsize(self.path) > 0
+            self._file = open(self.path, "a" if resume else "w", newline="", encoding="utf-8")
+            self._csv_writer = csv.writer(self._file, delimiter=',')
+            if not resume:
+                self._csv_writer.writerow(self.header)
+            self._file.flush()
+        else:
+            schema = pa.schema([(name, pa.string()) for name in self.header])
+            self._parquet_writer = pq.ParquetWriter(self.path, schema)
+
+    def write_rows(self, rows, on_flushed=None):
+        """
+        Queue rows for writing. Rows from one call are kept together in
+        the output. Never touches the file; only waits if the queue is full.
+
+        :param rows: Iterable of row sequences matching the header
+        :param on_flushed: Optional callable run on the writer thread once these rows are flushed
+        """
+        if self._error:
+            raise RuntimeError(f"RowSink writer failed: {self._error}")
+        rows = [list(row) for row in rows]
+        if rows or on_flushed:
+            self._queue.put((rows, on_flushed))
+
+    def write_row(self, row):
+        self.write_rows([row])
+
+    def _flush(self):
+        if self._buffer:
+            self._write_buffer()
+        callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error in RowSink flush callback: {e}")
+
+    def _write_buffer(self):
+        start = time.perf_counter()
+        if self.fmt == "csv":
+            self._csv_writer.writerows(self._buffer)
+            self._file.flush()
+        else:
+            columns = list(zip(*self._buffer))
+            table = pa.table({
+                name: pa.array(["" if v is None else str(v) for v in column], type=pa.string())
+                for name, column in zip(self.header, columns)
+            })
+            self._parquet_writer.write_table(table)
+        self.rows_written += len(self._buffer)
+        if self.metrics:
+            self.metrics.stage("output", "write").observe(time.perf_counter() - start)
+            self.metrics.counter("scraper_rows_total").inc(len(self._buffer))
+        self._buffer = []
+
+    def _run(self):
+        last_flush = time.monotonic()
+        while True:
+            timeout = max(0.0, self.flush_interval - (time.monotonic() - last_flush))
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            try:
+                if item is _STOP:
+                    self._flush()
+                    return
+                if item is not None:
+                    rows, on_flushed = item
+                    self._buffer.extend(rows)
+                    if on_flushed:
+                        self._callbacks.append(on_flushed)
+                if len(self._buffer) >= self.batch_size or time.monotonic() - last_flush >= self.flush_interval:
+                    self._flush()
+                    last_flush = time.monotonic()
+            except Exception as e:
+                print(f"Error writing to {self.path}: {e}")
+                self._error = e
+                self._buffer = []
+                self._callbacks = []
+
+    def close(self):
+        """
+        Drain the queue, flush remaining rows and close the output file.
+        """
+        self._queue.put(_STOP)
+        self._thread.join()
+        if self._file:
+            self._file.close()
+        if self._parquet_writer:
+            self._parquet_writer.close()
@@ -0,0 +1,32 @@
+from common.extract_spec import Field, Spec
+
+# Selectors live here so they can change without touching the crawl code.
+
+# Selector that shows a page kind has what we scrape from it, checked on both
+# HTTP and browser pages. A product page may lack a description, so its rating
+# or rating count also counts as ready.
+READY_SELECTORS = {
+    "home": ".MegaDropdownHeadingbox",
+    "listing": ".productWrapper",
+    "detail": "#content-details, .css-m6n3ou, .css-1hvvm95",
+}
+
+# One product card under .productWrapper on a listing page
+PRODUCT_CARD = Spec(
+    {
+        "product_name": Field(".css-xrzmfa"),
+        "price": Field(".css-111z9ua"),
+        "discount": Field(".css-cjd9an"),
+        "product_link": Field(attr="href"),
+    },
+    derived={
+        "brand": lambda record: record["product_name"].split()[0] if record["product_name"] else "",
+    }
+)
+
+# A product detail page
+PRODUCT_DETAIL = Spec({
+    "rating": Field(".css-m6n3ou", post=lambda value: value.replace("/5", "")),
+    "num_ratings": Field(".css-1hvvm95", post=lambda value: value.split(" ")[0]),
+    "description": Field("#content-details", text="spaced"),
+})
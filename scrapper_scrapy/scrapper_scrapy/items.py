@@ -6,7 +6,27 @@
 import scrapy
 
 
-class ScrapperScrapyItem(scrapy.Item):
-    # define the fields for your item here like:
-    # name = scrapy.Field()
-    pass
+class ZeptoProductItem(scrapy.Item):
+    # One product card on a Zepto category page
+    category = scrapy.Field()
+    category_link = scrapy.Field()
+    product_name = scrapy.Field()
+    product_link = scrapy.Field()
+    price = scrapy.Field()
+    quantity = scrapy.Field()
+    offer = scrapy.Field()
+
+
+class NykaaProductItem(scrapy.Item):
+    # One product under a MegaDropdown product type, joined with its detail page
+    category = scrapy.Field()
+    subcategory = scrapy.Field()
+    product_type = scrapy.Field()
+    product_name = scrapy.Field()
+    product_link = scrapy.Field()
+    brand = scrapy.Field()
+    price = scrapy.Field()
+    discount = scrapy.Field()
+    rating = scrapy.Field()
+    num_ratings = scrapy.Field()
+    description = scrapy.Field()
@@ -3,7 +3,14 @@
 # See documentation in:
 # https://docs.scrapy.org/en/latest/topics/spider-middleware.html
 
-from scrapy import signals
+import hashlib
+import json
+import math
+import os
+
+from scrapy import Request, signals
+from scrapy.dupefilters import BaseDupeFilter, RFPDupeFilter
+from scrapy.exceptions import NotConfigured
 
 # useful for handling different item types with a single interface
 from itemadapter import is_item, ItemAdapter
@@ -101,3 +108,204 @@ class ScrapperScrapyDownloaderMiddleware:
 
     def spider_opened(self, spider):
         spider.logger.info("Spider opened: %s" % spider.name)
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter sized for ``capacity`` keys at ``error_rate``.
+    Keys are bytes; the k bit positions come from double hashing one blake2b digest.
+    """
+
+    def __init__(self, capacity, error_rate, bits=None, count=0):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self.bits = bits if bits is not None else bytearray((self.num_bits + 7) // 8)
+        self.count = count
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def __contains__(self, key):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def add(self, key):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+
+class ScalableBloomFilter:
+    """
+    Scalable Bloom filter: when the current filter fills up, a larger one
+    with a tighter error rate is added, so the overall false-positive rate
+    stays under ``error_rate`` however many keys are seen, while memory
+    grows only with the number of keys actually seen.
+    """
+
+    GROWTH = 2
+    TIGHTENING = 0.9
+
+    def __init__(self, initial_capacity=100000, error_rate=0.001):
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.filters = []
+
+    def __contains__(self, key):
+        return any(key in f for f in self.filters)
+
+    def __len__(self):
+        return sum(f.count for f in self.filters)
+
+    @property
+    def size_bytes(self):
+        return sum(len(f.bits) for f in self.filters)
+
+    def add(self, key):
+        """
+        Add a key.
+
+        :return: True if the key was (probably) already present
+        """
+        if key in self:
+            return True
+        if not self.filters or self.filters[-1].count >= self.filters[-1].capacity:
+            n = len(self.filters)
+            self.filters.append(BloomFilter(
+                self.initial_capacity * self.GROWTH ** n,
+                self.error_rate * (1 - self.TIGHTENING) * self.TIGHTENING ** n
+            ))
+        self.filters[-1].add(key)
+        return False
+
+    def save(self, path):
+        """
+        Write the filter as a JSON header line followed by the raw bit arrays.
+        """
+        header = {
+            "initial_capacity": self.initial_capacity,
+            "error_rate": self.error_rate,
+            "filters": [
+                {"capacity": f.capacity, "error_rate": f.error_rate, "count": f.count}
+                for f in self.filters
+            ],
+        }
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as fh:
+            fh.write(json.dumps(header).encode("utf-8") + b"\n")
+            for f in self.filters:
+                fh.write(f.bits)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as fh:
+            header = json.loads(fh.readline())
+            sbf = cls(header["initial_capacity"], header["error_rate"])
+            for spec in header["filters"]:
+                f = BloomFilter(spec["capacity"], spec["error_rate"], count=spec["count"])
+                f.bits = bytearray(fh.read(len(f.bits)))
+                sbf.filters.append(f)
+        return sbf
+
+
+class BloomDupeFilterMiddleware:
+    """
+    Spider middleware that drops requests whose fingerprint was already
+    seen, using a ScalableBloomFilter instead of an unbounded set. Pair it
+    with DUPEFILTER_CLASS = "scrapper_scrapy.middlewares.BloomAwareDupeFilter"
+    so the scheduler only keeps its own set while the middleware is off.
+    Requests with dont_filter=True pass.
+
+    Settings:
+        BLOOMFILTER_ENABLED          Turn the middleware on (default False)
+        BLOOMFILTER_CAPACITY         Keys in the first filter (default 100000)
+        BLOOMFILTER_ERROR_RATE       Overall false-positive rate (default 0.001)
+        BLOOMFILTER_PATH             File to load from and save to between runs (default None)
+
+    Stats: bloomfilter/filtered, bloomfilter/seen, bloomfilter/bytes
+    """
+
+    def __init__(self, crawler, capacity=100000, error_rate=0.001, path=None):
+        self.crawler = crawler
+        self.stats = crawler.stats
+        self.path = path
+        if path and os.path.exists(path):
+            self.seen = ScalableBloomFilter.load(path)
+        else:
+            self.seen = ScalableBloomFilter(capacity, error_rate)
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        if not settings.getbool("BLOOMFILTER_ENABLED"):
+            raise NotConfigured
+        s = cls(
+            crawler,
+            capacity=settings.getint("BLOOMFILTER_CAPACITY", 100000),
+            error_rate=settings.getfloat("BLOOMFILTER_ERROR_RATE", 0.001),
+            path=settings.get("BLOOMFILTER_PATH"),
+        )
+        crawler.signals.connect(s.spider_closed, signal=signals.spider_closed)
+        return s
+
+    def _fingerprint(self, request):
+        fingerprinter = getattr(self.crawler, "request_fingerprinter", None)
+        if fingerprinter is not None:
+            return fingerprinter.fingerprint(request)
+        from scrapy.utils.request import request_fingerprint
+        return request_fingerprint(request).encode("ascii")
+
+    def _keep(self, r):
+        if isinstance(r, Request) and not r.dont_filter:
+            if self.seen.add(self._fingerprint(r)):
+                self.stats.inc_value("bloomfilter/filtered")
+                return False
+            self.stats.inc_value("bloomfilter/seen")
+        return True
+
+    def _filter(self, requests_or_items):
+        for r in requests_or_items:
+            if self._keep(r):
+                yield r
+
+    def process_spider_output(self, response, result, spider):
+        return self._filter(result)
+
+    async def process_spider_output_async(self, response, result, spider):
+        async for r in result:
+            if self._keep(r):
+                yield r
+
+    async def process_start(self, start):
+        async for r in start:
+            if self._keep(r):
+                yield r
+
+    def process_start_requests(self, start_requests, spider):
+        # Scrapy < 2.13; newer versions call process_start
+        return self._filter(start_requests)
+
+    def spider_closed(self, spider):
+        self.stats.set_value("bloomfilter/bytes", self.seen.size_bytes)
+        if self.path:
+            self.seen.save(self.path)
+
+
+class BloomAwareDupeFilter(RFPDupeFilter):
+    """
+    Scheduler dupefilter that steps aside while BloomDupeFilterMiddleware is
+    enabled, and falls back to Scrapy's fingerprint set when it isn't, so
+    turning the Bloom filter off never leaves a crawl without dedup.
+    """
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if crawler.settings.getbool("BLOOMFILTER_ENABLED"):
+            return BaseDupeFilter()
+        return super().from_crawler(crawler)
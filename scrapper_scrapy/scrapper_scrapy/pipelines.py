@@ -3,11 +3,174 @@
 # Don't forget to add your pipeline to the ITEM_PIPELINES setting
 # See: https://docs.scrapy.org/en/latest/topics/item-pipeline.html
 
+import hashlib
+import os
+import sqlite3
+import time
 
 # useful for handling different item types with a single interface
 from itemadapter import ItemAdapter
+from scrapy.exceptions import DropItem, NotConfigured
+from twisted.internet import task
+
+from scrapper_scrapy.items import NykaaProductItem, ZeptoProductItem
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+
+# Table name and key fields per item type. A product legitimately shows up
+# in several listings, so the key is its URL plus the listing it came from.
+ITEM_TABLES = {
+    ZeptoProductItem: ("zepto_products", ("product_link", "category")),
+    NykaaProductItem: ("nykaa_products", ("product_link", "category", "subcategory", "product_type")),
+}
+
+# table -> (key fields, all columns)
+TABLE_COLUMNS = {
+    table: (key_fields, sorted(item_class.fields))
+    for item_class, (table, key_fields) in ITEM_TABLES.items()
+}
 
 
 class ScrapperScrapyPipeline:
+    """
+    Buffers items, drops duplicates within a crawl and writes them in
+    batches: upserts into SQLite and/or Parquet row groups. Buffers are
+    flushed every STORAGE_BATCH_SIZE items, every STORAGE_FLUSH_INTERVAL
+    seconds, and when the spider closes.
+
+    Settings:
+        STORAGE_SQLITE_PATH     SQLite database file (None disables SQLite)
+        STORAGE_PARQUET_DIR     Directory for <table>.parquet files (None disables Parquet)
+        STORAGE_BATCH_SIZE      Items per table buffered before a flush (default 1000)
+        STORAGE_FLUSH_INTERVAL  Maximum seconds between flushes (default 10)
+    """
+
+    def __init__(self, sqlite_path=None, parquet_dir=None, batch_size=1000, flush_interval=10.0):
+        if not sqlite_path and not parquet_dir:
+            raise NotConfigured("Set STORAGE_SQLITE_PATH and/or STORAGE_PARQUET_DIR")
+        if parquet_dir and pa is None:
+            raise NotConfigured("pyarrow is required for STORAGE_PARQUET_DIR")
+
+        self.sqlite_path = sqlite_path
+        self.parquet_dir = parquet_dir
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self.db = None
+        self.parquet_writers = {}
+        self.buffers = {}
+        self.created_tables = set()
+        self.seen = set()
+        self.flush_loop = None
+        self.last_flush = time.monotonic()
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        return cls(
+            sqlite_path=settings.get("STORAGE_SQLITE_PATH"),
+            parquet_dir=settings.get("STORAGE_PARQUET_DIR"),
+            batch_size=settings.getint("STORAGE_BATCH_SIZE", 1000),
+            flush_interval=settings.getfloat("STORAGE_FLUSH_INTERVAL", 10.0),
+        )
+
+    def open_spider(self, spider):
+        if self.sqlite_path:
+            self.db = sqlite3.connect(self.sqlite_path)
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("PRAGMA synchronous=NORMAL")
+        if self.parquet_dir:
+            os.makedirs(self.parquet_dir, exist_ok=True)
+
+        # Time-based flushing so a slow crawl doesn't sit on a half-full buffer
+        self.flush_loop = task.LoopingCall(self._flush_if_due)
+        self.flush_loop.start(self.flush_interval, now=False)
+
+    def close_spider(self, spider):
+        if self.flush_loop and self.flush_loop.running:
+            self.flush_loop.stop()
+        self.flush_all()
+        if self.db:
+            self.db.close()
+        for writer in self.parquet_writers.values():
+            writer.close()
+
     def process_item(self, item, spider):
+        table, key_fields = self._table_for(item)
+        if table is None:
+            return item
+        adapter = ItemAdapter(item)
+
+        # A short digest keeps the per-crawl seen set small
+        key = "\x1f".join(str(adapter.get(field, "")) for field in key_fields)
+        digest = hashlib.blake2b(f"{table}\x1f{key}".encode("utf-8"), digest_size=8).digest()
+        if digest in self.seen:
+            raise DropItem(f"Duplicate item: {key}")
+        self.seen.add(digest)
+
+        buffer = self.buffers.setdefault(table, [])
+        buffer.append(adapter.asdict())
+        if len(buffer) >= self.batch_size:
+            self.flush(table)
         return item
+
+    @staticmethod
+    def _table_for(item):
+        for item_class, spec in ITEM_TABLES.items():
+            if isinstance(item, item_class):
+                return spec
+        return None, None
+
+    def _flush_if_due(self):
+        if time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush_all()
+
+    def flush_all(self):
+        for table in list(self.buffers):
+            self.flush(table)
+        self.last_flush = time.monotonic()
+
+    def flush(self, table):
+        rows = self.buffers.pop(table, None)
+        if not rows:
+            return
+        key_fields, columns = TABLE_COLUMNS[table]
+        if self.db:
+            self._write_sqlite(table, key_fields, columns, rows)
+        if self.parquet_dir:
+            self._write_parquet(table, columns, rows)
+
+    def _write_sqlite(self, table, key_fields, columns, rows):
+        if table not in self.created_tables:
+            self.db.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                + ", ".join(f"{column} TEXT" for column in columns)
+                + f", PRIMARY KEY ({', '.join(key_fields)}))"
+            )
+            self.created_tables.add(table)
+
+        updates = ", ".join(f"{column} = excluded.{column}" for column in columns if column not in key_fields)
+        sql = (
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)}) "
+            f"ON CONFLICT ({', '.join(key_fields)}) DO UPDATE SET {updates}"
+        )
+        with self.db:
+            self.db.executemany(sql, [[row.get(column) for column in columns] for row in rows])
+
+    def _write_parquet(self, table, columns, rows):
+        writer = self.parquet_writers.get(table)
+        if writer is None:
+            schema = pa.schema([(column, pa.string()) for column in columns])
+            writer = pq.ParquetWriter(os.path.join(self.parquet_dir, f"{table}.parquet"), schema)
+            self.parquet_writers[table] = writer
+        data = {
+            column: pa.array([None if row.get(column) is None else str(row.get(column)) for row in rows], type=pa.string())
+            for column in columns
+        }
+        writer.write_table(pa.table(data))
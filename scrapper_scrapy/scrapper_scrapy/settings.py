@@ -14,20 +14,21 @@ NEWSPIDER_MODULE = "scrapper_scrapy.spiders"
 
 
 # Crawl responsibly by identifying yourself (and your website) on the user-agent
-#USER_AGENT = "scrapper_scrapy (+http://www.yourdomain.com)"
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.93 Safari/537.36"
 
 # Obey robots.txt rules
 ROBOTSTXT_OBEY = True
 
 # Configure maximum concurrent requests performed by Scrapy (default: 16)
-#CONCURRENT_REQUESTS = 32
+CONCURRENT_REQUESTS = 32
 
 # Configure a delay for requests for the same website (default: 0)
 # See https://docs.scrapy.org/en/latest/topics/settings.html#download-delay
 # See also autothrottle settings and docs
 #DOWNLOAD_DELAY = 3
 # The download delay setting will honor only one of:
-#CONCURRENT_REQUESTS_PER_DOMAIN = 16
+# (spiders override this per site in custom_settings)
+CONCURRENT_REQUESTS_PER_DOMAIN = 8
 #CONCURRENT_REQUESTS_PER_IP = 16
 
 # Disable cookies (enabled by default)
@@ -44,9 +45,17 @@ ROBOTSTXT_OBEY = True
 
 # Enable or disable spider middlewares
 # See https://docs.scrapy.org/en/latest/topics/spider-middleware.html
-#SPIDER_MIDDLEWARES = {
-#    "scrapper_scrapy.middlewares.ScrapperScrapySpiderMiddleware": 543,
-#}
+SPIDER_MIDDLEWARES = {
+    "scrapper_scrapy.middlewares.BloomDupeFilterMiddleware": 50,
+}
+
+# Bounded-memory request dedup: while enabled, the Bloom filter middleware
+# replaces the scheduler's in-memory fingerprint set
+BLOOMFILTER_ENABLED = True
+BLOOMFILTER_CAPACITY = 100000
+BLOOMFILTER_ERROR_RATE = 0.001
+BLOOMFILTER_PATH = None
+DUPEFILTER_CLASS = "scrapper_scrapy.middlewares.BloomAwareDupeFilter"
 
 # Enable or disable downloader middlewares
 # See https://docs.scrapy.org/en/latest/topics/downloader-middleware.html
@@ -62,20 +71,25 @@ ROBOTSTXT_OBEY = True
 
 # Configure item pipelines
 # See https://docs.scrapy.org/en/latest/topics/item-pipeline.html
-#ITEM_PIPELINES = {
-#    "scrapper_scrapy.pipelines.ScrapperScrapyPipeline": 300,
-#}
+ITEM_PIPELINES = {
+    "scrapper_scrapy.pipelines.ScrapperScrapyPipeline": 300,
+}
+# Batched storage for ScrapperScrapyPipeline; set either path to None to disable it
+STORAGE_SQLITE_PATH = "products.sqlite3"
+STORAGE_PARQUET_DIR = None
+STORAGE_BATCH_SIZE = 1000
+STORAGE_FLUSH_INTERVAL = 10
 
 # Enable and configure the AutoThrottle extension (disabled by default)
 # See https://docs.scrapy.org/en/latest/topics/autothrottle.html
-#AUTOTHROTTLE_ENABLED = True
+AUTOTHROTTLE_ENABLED = True
 # The initial download delay
-#AUTOTHROTTLE_START_DELAY = 5
+AUTOTHROTTLE_START_DELAY = 1
 # The maximum download delay to be set in case of high latencies
-#AUTOTHROTTLE_MAX_DELAY = 60
+AUTOTHROTTLE_MAX_DELAY = 30
 # The average number of requests Scrapy should be sending in parallel to
-# each remote server
-#AUTOTHROTTLE_TARGET_CONCURRENCY = 1.0
+# each remote server (spiders override this per site in custom_settings)
+AUTOTHROTTLE_TARGET_CONCURRENCY = 2.0
 # Enable showing throttling stats for every response received:
 #AUTOTHROTTLE_DEBUG = False
 
@@ -0,0 +1,94 @@
+import scrapy
+from scrapy.selector import SelectorList
+
+from scrapper_scrapy.items import NykaaProductItem
+
+
+def _text(selector, separator=""):
+    """Text of a selector (or the first match of a list), stripped at the ends like ``tag.text.strip()``."""
+    if isinstance(selector, SelectorList):
+        if not selector:
+            return ""
+        selector = selector[0]
+    return separator.join(selector.css("::text").getall()).strip()
+
+
+class NykaaSpider(scrapy.Spider):
+    """
+    Nykaa MegaDropdown -> listing -> detail crawl. Each product on a
+    listing becomes one item, completed with the fields from its detail page.
+    """
+
+    name = "nykaa"
+    allowed_domains = ["nykaa.com", "www.nykaa.com"]
+    start_urls = ["https://www.nykaa.com"]
+
+    custom_settings = {
+        "CONCURRENT_REQUESTS_PER_DOMAIN": 4,
+        "AUTOTHROTTLE_TARGET_CONCURRENCY": 2.0,
+    }
+
+    def parse(self, response):
+        for category_section in response.css(".MegaDropdownHeadingbox"):
+            if not category_section.css("a"):
+                continue
+            category = _text(category_section.css("a"))
+
+            for subcategory in category_section.css(".MegaDropdown-ContentInner .MegaDropdown-ContentHeading"):
+                if not subcategory.css("a"):
+                    continue
+                subcategory_name = _text(subcategory.css("a"))
+
+                for product_type in subcategory.xpath("following-sibling::ul[1]").css("li a"):
+                    yield response.follow(
+                        product_type,
+                        callback=self.parse_listing,
+                        cb_kwargs={
+                            "category": category,
+                            "subcategory": subcategory_name,
+                            "product_type": _text(product_type),
+                        }
+                    )
+
+    def parse_listing(self, response, category, subcategory, product_type):
+        for product in response.css(".productWrapper a"):
+            product_name = _text(product.css(".css-xrzmfa"))
+            item = NykaaProductItem(
+                category=category,
+                subcategory=subcategory,
+                product_type=product_type,
+                product_name=product_name,
+                product_link=product.attrib.get("href", ""),
+                brand=product_name.split()[0] if product_name else "",
+                price=_text(product.css(".css-111z9ua")),
+                discount=_text(product.css(".css-cjd9an")),
+                rating="",
+                num_ratings="",
+                description="",
+            )
+
+            if not item["product_link"]:
+                yield item
+                continue
+
+            # The same product appears under several product types and each
+            # occurrence needs its own item, so the detail request is not deduplicated.
+            yield response.follow(
+                item["product_link"],
+                callback=self.parse_detail,
+                cb_kwargs={"item": item},
+                errback=self.detail_failed,
+                dont_filter=True
+            )
+
+    def parse_detail(self, response, item):
+        item["rating"] = _text(response.css(".css-m6n3ou")).replace("/5", "")
+        num_ratings = _text(response.css(".css-1hvvm95"))
+        item["num_ratings"] = num_ratings.split(" ")[0] if num_ratings else ""
+        item["description"] = _text(response.css("#content-details"), separator=" ")
+        yield item
+
+    def detail_failed(self, failure):
+        # Keep the listing fields even if the detail page could not be fetched
+        self.logger.warning("Detail page failed: %s", failure.request.url)
+        yield failure.request.cb_kwargs["item"]
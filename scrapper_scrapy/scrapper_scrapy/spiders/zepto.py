@@ -0,0 +1,59 @@
+import scrapy
+
+from scrapper_scrapy.items import ZeptoProductItem
+
+
+def _text(selector, default="N/A"):
+    """Stripped text of the first match, like BeautifulSoup's get_text(strip=True)."""
+    if not selector:
+        return default
+    return "".join(part.strip() for part in selector[0].css("::text").getall())
+
+
+class ZeptoSpider(scrapy.Spider):
+    """
+    Zepto category -> product crawl: the home page lists the categories,
+    and each category page holds the product cards.
+    """
+
+    name = "zepto"
+    allowed_domains = ["zeptonow.com"]
+    start_urls = ["https://zeptonow.com/"]
+
+    custom_settings = {
+        "CONCURRENT_REQUESTS_PER_DOMAIN": 8,
+        "AUTOTHROTTLE_TARGET_CONCURRENCY": 4.0,
+    }
+
+    def parse(self, response):
+        # The "Categories" header is followed by the <ul> of category links
+        categories_list = response.xpath('//h3[normalize-space()="Categories"]/following::ul[1]')
+        if not categories_list:
+            self.logger.error("Categories list not found on %s", response.url)
+            return
+
+        for link in categories_list.xpath(".//li//a"):
+            category = _text(link.css("p"))
+            yield response.follow(
+                link,
+                callback=self.parse_category,
+                cb_kwargs={"category": category}
+            )
+
+    def parse_category(self, response, category):
+        product_cards = response.css('a[data-testid="product-card"]')
+        if not product_cards:
+            self.logger.info("No products found in category: %s", category)
+            return
+
+        for card in product_cards:
+            yield ZeptoProductItem(
+                category=category,
+                category_link=response.url,
+                product_name=_text(card.css('[data-testid="product-card-name"]')),
+                product_link=response.urljoin(card.attrib.get("href", "")),
+                price=_text(card.css('[data-testid="product-card-price"]')),
+                quantity=_text(card.css('[data-testid="product-card-quantity"] h5')),
+                # e.g. "24% Off"
+                offer=_text(card.xpath('.//p[contains(text(), "Off")]')),
+            )
@@ -0,0 +1,14 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(ROOT, "bench", "fixtures")
+
+# The scripts import their siblings flat, and the Scrapy project is its own package root
+for path in (ROOT, os.path.join(ROOT, "nykaa"), os.path.join(ROOT, "scrapper_scrapy")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+def fixture_path(name):
+    return os.path.join(FIXTURES_DIR, name)
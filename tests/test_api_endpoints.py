@@ -0,0 +1,76 @@
+from api_endpoints import ApiClient, ApiTemplates
+
+LISTING = {
+    "url": "https://www.nykaa.com/app-api/products?category_id={id}",
+    "page_param": "page_no", "first_page": 1, "offset": False,
+    "records_path": ["response", "products"], "total_path": None,
+    "fields": {"product_name": "name", "brand": "brandName", "price": "offerPrice",
+               "discount": "discount", "product_link": "actionUrl"},
+}
+DETAIL = {
+    "url": "https://www.nykaa.com/app-api/product?productId={id}",
+    "record_path": ["response"],
+    "fields": {"rating": "rating", "num_ratings": "ratingCount", "description": "description"},
+}
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, data):
+        self.data = data
+
+    def json(self):
+        return self.data
+
+
+class FakeSession:
+    """Serves ``pages[page_no]`` product counts; a page number past the end repeats the last page."""
+
+    def __init__(self, pages, ignore_page=False):
+        self.pages = pages
+        self.ignore_page = ignore_page
+        self.calls = 0
+
+    def get(self, url, params=None, timeout=None, headers=None):
+        self.calls += 1
+        if "productId" in url:
+            return FakeResponse({"response": {"rating": 4.3, "ratingCount": 1234, "description": "<p>Soft <b>matte</b></p>"}})
+        page = 1 if self.ignore_page else min(params["page_no"], len(self.pages))
+        return FakeResponse({"response": {"products": [
+            {"name": f"Lakme Shade {page}-{i}", "brandName": "Lakme", "offerPrice": 816.0, "discount": 8,
+             "actionUrl": f"https://www.nykaa.com/lakme-shade/p/{page * 100 + i}?productId={page * 100 + i}"}
+            for i in range(self.pages[page - 1])
+        ]}})
+
+
+def _client(session):
+    templates = ApiTemplates(None)
+    templates.templates = {"listing": LISTING, "detail": DETAIL}
+    return ApiClient(templates, session)
+
+
+def test_listing_follows_pages_until_a_short_page():
+    session = FakeSession([20, 20, 7])
+    cards = _client(session).listing("/makeup/lips/lipstick/c/249")
+
+    assert len(cards) == 47
+    assert session.calls == 3
+
+
+def test_listing_stops_when_the_endpoint_ignores_the_page():
+    session = FakeSession([20], ignore_page=True)
+    cards = _client(session).listing("/makeup/lips/lipstick/c/249")
+
+    assert len(cards) == 20
+    assert session.calls == 2
+
+
+def test_api_values_match_the_html_format():
+    client = _client(FakeSession([1]))
+    (card,) = client.listing("/makeup/lips/lipstick/c/249")
+
+    assert card["price"] == "₹816"
+    assert card["discount"] == "8% Off"
+    assert card["product_link"] == "/lakme-shade/p/100?productId=100"
+    assert client.detail(card["product_link"]) == {"rating": "4.3", "num_ratings": "1234", "description": "Soft matte"}
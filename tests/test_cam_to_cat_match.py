@@ -0,0 +1,223 @@
+import random
+import re
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+import cam_to_cat_match
+from cam_to_cat_match import RateLimiter, call_with_retry, check_all_categories, match_campaigns, parse_batch_response
+from category_prompt import CategoryPrompt
+
+CATEGORIES = pd.DataFrame({
+    "CategoryId": [1, 2, 3, 4],
+    "Category1": ["makeup", "makeup", "skin", "hair"],
+    "Category2": ["Lips", "Eyes", "Moisturizers", "Shampoo"],
+    "Category3": ["Lipstick", "Kajal", "Face Cream", "Anti Dandruff"],
+})
+
+
+class FakeModel:
+    """Offline stand-in for the Gemini model.
+
+    It answers batch prompts by matching campaign words against category names,
+    can add random latency, raises a 429-style error every ``rate_limit_every``
+    calls, and fails outright for prompts mentioning ``fail_on``.
+    """
+
+    class RateLimitError(Exception):
+        code = 429
+
+    class Response:
+        def __init__(self, text):
+            self.text = text
+
+    def __init__(self, latency=0.0, rate_limit_every=0, fail_on=None):
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.fail_on = fail_on
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def generate_content(self, prompt):
+        with self.lock:
+            self.calls += 1
+            calls = self.calls
+        if self.rate_limit_every and calls % self.rate_limit_every == 0:
+            raise FakeModel.RateLimitError("429 Resource has been exhausted (fake)")
+        if self.fail_on and self.fail_on in prompt:
+            raise ValueError("500 Internal error (fake)")
+        time.sleep(random.uniform(0, self.latency))
+
+        campaigns = re.findall(r'^\s*(\S+) - "(.*)"\s*$', prompt, re.MULTILINE)
+
+        # Category block: "Category1" lines, then " Category2: ID Category3; ID Category3"
+        categories = []
+        category1 = ""
+        block = prompt.split(CategoryPrompt.HEADER, 1)[-1].strip().split("\n\n", 1)[0]
+        for line in block.split("\n"):
+            group = re.match(r'^\s*(.*?): (\d+\b.*)$', line)
+            if not group:
+                category1 = line.strip()
+                continue
+            for leaf in group.group(2).split("; "):
+                category_id, _, category3 = leaf.partition(" ")
+                categories.append((category_id, f"{category1} {group.group(1)} {category3}"))
+        lines = ["campaignId,categoryId,match"]
+        for campaign_id, campaign_text in campaigns:
+            words = set(re.findall(r"[a-z]+", campaign_text.lower()))
+            for category_id, names in categories:
+                overlap = words & set(re.findall(r"[a-z]+", names.lower()))
+                if overlap:
+                    lines.append(f"{campaign_id},{category_id},{'strong' if len(overlap) > 1 else 'medium'}")
+        return FakeModel.Response("\n".join(lines))
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    # Retries back off for seconds; the tests only care that they happen
+    monkeypatch.setattr(cam_to_cat_match.time, "sleep", lambda seconds: None)
+
+
+def test_parse_batch_response_keeps_known_campaigns_and_labels():
+    text = """campaignId,categoryId,match
+    BP001, 1, Strong
+    BP001,2,medium
+    BP002,3,weak
+    BP009,4,strong
+    not a csv line
+    """
+
+    assert parse_batch_response(text, ["BP001", "BP002"]) == {
+        "BP001": [{"categoryId": "1", "match": "strong"}, {"categoryId": "2", "match": "medium"}],
+        "BP002": [],
+    }
+
+
+def test_rate_limiter_waits_for_the_window(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(cam_to_cat_match.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(cam_to_cat_match.time, "sleep", lambda seconds: clock.__setitem__(0, clock[0] + seconds))
+    limiter = RateLimiter(requests_per_minute=2, tokens_per_minute=100)
+
+    limiter.acquire(10)
+    limiter.acquire(10)
+    assert clock[0] == 0.0
+    limiter.acquire(10)
+    assert clock[0] == pytest.approx(60.0)
+
+    # Tokens are limited too; a single oversized request goes through on an empty window
+    limiter = RateLimiter(requests_per_minute=100, tokens_per_minute=100)
+    clock[0] = 0.0
+    limiter.acquire(500)
+    limiter.acquire(1)
+    assert clock[0] == pytest.approx(60.0)
+
+
+def test_call_with_retry_retries_429s_only():
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise FakeModel.RateLimitError("429 Too Many Requests")
+        return "ok"
+
+    assert call_with_retry(flaky, base_delay=0) == "ok"
+    assert len(calls) == 3
+
+    def broken():
+        calls.append(1)
+        raise ValueError("bad request")
+
+    calls.clear()
+    with pytest.raises(ValueError):
+        call_with_retry(broken, base_delay=0)
+    assert len(calls) == 1
+
+    def exhausted():
+        calls.append(1)
+        raise FakeModel.RateLimitError("429 Resource has been exhausted")
+
+    calls.clear()
+    with pytest.raises(FakeModel.RateLimitError):
+        call_with_retry(exhausted, max_retries=2, base_delay=0)
+    assert len(calls) == 3
+
+
+def test_match_campaigns_keeps_each_campaigns_own_matches(no_sleep):
+    campaigns = [(f"C{i:02d}", text) for i, text in enumerate(
+        ["Lipstick week", "Kajal sale", "Face cream deals", "Anti dandruff shampoo"] * 5)]
+    model = FakeModel(latency=0.01, rate_limit_every=4)
+
+    results = match_campaigns(model, campaigns, CATEGORIES, batch_size=3, max_workers=4)
+
+    expected = {"Lipstick week": {"1"}, "Kajal sale": {"2"}, "Face cream deals": {"3"}, "Anti dandruff shampoo": {"4"}}
+    assert set(results) == {campaign_id for campaign_id, _ in campaigns}
+    assert model.calls > len(campaigns) // 3  # some calls were rate limited and retried
+    for campaign_id, text in campaigns:
+        assert {match["categoryId"] for match in results[campaign_id]} == expected[text]
+
+
+def test_match_campaigns_isolates_failed_batches(no_sleep, tmp_path):
+    campaigns = [("C1", "Lipstick week"), ("C2", "Kajal sale"), ("C3", "Face cream deals"), ("C4", "broken")]
+    cache = cam_to_cat_match.MatchCache(str(tmp_path / "cache.sqlite3"))
+
+    results = match_campaigns(FakeModel(fail_on="broken"), campaigns, CATEGORIES, batch_size=2, cache=cache)
+
+    # The failed batch is left out instead of failing the whole run ...
+    assert [match["categoryId"] for match in results["C1"]] == ["1"]
+    assert "C3" not in results and "C4" not in results
+    # ... and isn't cached, so the next run retries it
+    model = FakeModel()
+    results = match_campaigns(model, campaigns[:3], CATEGORIES, batch_size=2, cache=cache)
+    assert [match["categoryId"] for match in results["C3"]] == ["3"]
+    assert model.calls == 1
+    cache.close()
+
+
+def test_incremental_run_redoes_failed_campaigns_and_matches_new_categories(no_sleep, tmp_path):
+    files = {name: str(tmp_path / name) for name in (
+        "campaigns.csv", "categories.csv", "matches.csv", "campaigns_snapshot.csv", "categories_snapshot.csv")}
+    pd.DataFrame({
+        "campaignId": ["C1", "C2", "C3"], "campaignText": ["Lipstick week", "Kajal sale", "broken shampoo"],
+    }).to_csv(files["campaigns.csv"], index=False)
+
+    def run(categories, model):
+        categories.to_csv(files["categories.csv"], index=False)
+        cam_to_cat_match.main(
+            None, files["campaigns.csv"], files["categories.csv"], files["matches.csv"],
+            batch_size=1, model=model, cache_file=None, incremental=True, metrics_file=None,
+            campaign_snapshot_file=files["campaigns_snapshot.csv"],
+            category_snapshot_file=files["categories_snapshot.csv"])
+        return {tuple(row) for row in pd.read_csv(files["matches.csv"], dtype=str).itertuples(index=False)}
+
+    # C3's batch fails, so it is left out of the snapshot
+    assert run(CATEGORIES.iloc[:3], FakeModel(fail_on="broken")) == {("C1", "1", "medium"), ("C2", "2", "medium")}
+    assert set(pd.read_csv(files["campaigns_snapshot.csv"])["campaignId"]) == {"C1", "C2"}
+
+    # Category 2 removed and 4 added since the last match run: C1 and C2 are only checked
+    # against category 4, C3 against everything, and C2's match to category 2 is dropped
+    model = FakeModel()
+    categories = CATEGORIES.iloc[[0, 2, 3]]
+    assert run(categories, model) == {("C1", "1", "medium"), ("C3", "4", "medium")}
+    assert model.calls == 3
+    assert set(pd.read_csv(files["categories_snapshot.csv"])["CategoryId"]) == {1, 3, 4}
+
+
+def test_check_all_categories_caches_its_answer(tmp_path):
+    class SingleModel:
+        calls = 0
+
+        def generate_content(self, prompt):
+            self.calls += 1
+            return FakeModel.Response("categoryId,match\n1,strong\n2,weak")
+
+    model = SingleModel()
+    cache = cam_to_cat_match.MatchCache(str(tmp_path / "cache.sqlite3"))
+    for _ in range(2):
+        assert check_all_categories(model, "Lipstick week", CATEGORIES, cache=cache) == [
+            {"categoryId": "1", "match": "strong"}]
+    assert model.calls == 1
+    cache.close()
@@ -0,0 +1,36 @@
+from category_registry import CategoryRegistry
+
+
+def test_ids_are_stable_and_changes_reported(tmp_path):
+    path = str(tmp_path / "registry.sqlite3")
+    registry = CategoryRegistry(path)
+    assert [registry.id_for(key) for key in [("A", "B", "C"), ("A", "B", "D"), ("A", "B", "C")]] == [1, 2, 1]
+    assert registry.finish() == ([(1, ("A", "B", "C")), (2, ("A", "B", "D"))], [])
+    registry.close()
+
+    registry = CategoryRegistry(path)
+    assert registry.id_for(("A", "B", "D")) == 2
+    assert registry.id_for(("A", None, "E")) == 3
+    assert registry.finish() == ([(3, ("A", "", "E"))], [(1, ("A", "B", "C"))])
+    assert registry.active() == [(2, ("A", "B", "D")), (3, ("A", "", "E"))]
+    registry.close()
+
+
+def test_categories_from_a_crashed_run_are_still_reported_as_added(tmp_path):
+    path = str(tmp_path / "registry.sqlite3")
+    registry = CategoryRegistry(path)
+    registry.id_for(("A", "B", "C"))
+    registry.finish()
+    registry.close()
+
+    # The run registers a new category, then dies before finish(); close() still commits
+    registry = CategoryRegistry(path)
+    registry.id_for(("A", "B", "C"))
+    assert registry.id_for(("A", "B", "E")) == 2
+    registry.close()
+
+    registry = CategoryRegistry(path)
+    registry.id_for(("A", "B", "C"))
+    assert registry.id_for(("A", "B", "E")) == 2
+    assert registry.finish() == ([(2, ("A", "B", "E"))], [])
+    registry.close()
@@ -0,0 +1,25 @@
+import os
+
+from checkpoint import CrawlCheckpoint
+
+
+def test_checkpoint_resumes_after_a_crash(tmp_path):
+    path = str(tmp_path / "checkpoint.sqlite3")
+    checkpoint = CrawlCheckpoint(path)
+    assert not checkpoint.resuming
+    checkpoint.record("makeup\tlips\tlipstick\t/lipstick")
+    # The run dies here: close() but no finish()
+    checkpoint.close()
+
+    checkpoint = CrawlCheckpoint(path)
+    assert checkpoint.resuming
+    assert checkpoint.is_done("makeup\tlips\tlipstick\t/lipstick")
+    assert not checkpoint.is_done("makeup\teyes\tkajal\t/kajal")
+    checkpoint.record("makeup\teyes\tkajal\t/kajal")
+
+    # A complete run deletes the journal, so the next one starts fresh
+    checkpoint.finish()
+    assert not os.path.exists(path)
+    checkpoint = CrawlCheckpoint(path)
+    assert not checkpoint.resuming
+    checkpoint.close()
@@ -0,0 +1,56 @@
+import threading
+import time
+
+from detail_cache import DetailCache, normalize_link
+
+
+def test_normalize_link_drops_host_query_and_trailing_slash():
+    assert normalize_link("https://www.nykaa.com/Lakme-Kajal/p/123/?skuId=123&ptype=product") == "/lakme-kajal/p/123"
+    assert normalize_link("/lakme-kajal/p/123") == "/lakme-kajal/p/123"
+
+
+def test_concurrent_lookups_of_one_product_load_it_once():
+    cache = DetailCache()
+    release = threading.Event()
+    loads = []
+
+    def load(link):
+        loads.append(link)
+        release.wait(5)
+        return {"rating": "4.2"}
+
+    links = ["/lakme-kajal/p/123?skuId=%d" % index for index in range(8)]
+    results = []
+    threads = [threading.Thread(target=lambda link=link: results.append(cache.get_or_load(link, load)))
+               for link in links]
+    for thread in threads:
+        thread.start()
+    # Let every other lookup find the first one in flight before it finishes
+    deadline = time.monotonic() + 5
+    while cache.stats()["coalesced"] < len(links) - 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(loads) == 1
+    assert results == [{"rating": "4.2"}] * len(links)
+    assert cache.stats() == {"memory_hits": 0, "disk_hits": 0, "coalesced": len(links) - 1, "misses": 1}
+    assert cache.get_or_load(links[0], load) == {"rating": "4.2"}
+    assert cache.stats()["memory_hits"] == 1
+    cache.close()
+
+
+def test_failed_loads_are_retried_and_results_persist(tmp_path):
+    path = str(tmp_path / "details.sqlite3")
+    cache = DetailCache(path=path)
+    assert cache.get_or_load("/kajal/p/1", lambda link: {}) == {}
+    assert cache.get_or_load("/kajal/p/1", lambda link: {"rating": "4.0"}) == {"rating": "4.0"}
+    assert cache.stats()["misses"] == 2
+    cache.close()
+
+    # A new run finds it on disk without loading it
+    cache = DetailCache(path=path)
+    assert cache.get_or_load("/kajal/p/1", lambda link: {"rating": "1.0"}) == {"rating": "4.0"}
+    assert cache.stats()["disk_hits"] == 1
+    cache.close()
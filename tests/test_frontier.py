@@ -0,0 +1,75 @@
+import threading
+import time
+
+from common.frontier import Frontier
+
+QUEUE = "nykaa:product_types:test"
+
+
+def test_expired_lease_is_leased_again_unless_extended(tmp_path):
+    frontier = Frontier(str(tmp_path / "frontier.sqlite3"), visibility_timeout=0.5)
+    frontier.add(QUEUE, [("lipstick", ["makeup", "lips", "lipstick", "/lipstick"])])
+
+    assert frontier.lease(QUEUE, "a") == [("lipstick", ["makeup", "lips", "lipstick", "/lipstick"])]
+    assert frontier.lease(QUEUE, "b") == []
+
+    # The live worker keeps its lease; another worker can't extend it
+    time.sleep(0.3)
+    assert frontier.extend(QUEUE, "lipstick", "a")
+    assert not frontier.extend(QUEUE, "lipstick", "b")
+    time.sleep(0.3)
+    assert frontier.lease(QUEUE, "b") == []
+
+    # Once worker "a" stops renewing, the task is handed out again
+    time.sleep(0.4)
+    assert [key for key, _ in frontier.lease(QUEUE, "b")] == ["lipstick"]
+    frontier.ack(QUEUE, "lipstick")
+    assert frontier.finished(QUEUE)
+    frontier.close()
+
+
+def test_task_is_given_up_after_max_attempts(tmp_path):
+    frontier = Frontier(str(tmp_path / "frontier.sqlite3"), max_attempts=2)
+    assert not frontier.finished(QUEUE)
+    frontier.add(QUEUE, [("lipstick", {}), ("kajal", {})])
+    assert frontier.add(QUEUE, [("lipstick", {})]) == 0
+
+    for _ in range(2):
+        assert "kajal" in [key for key, _ in frontier.lease(QUEUE, limit=2)]
+        frontier.release(QUEUE, "kajal")
+        frontier.release(QUEUE, "lipstick")
+    assert frontier.lease(QUEUE) == []
+    assert frontier.outstanding(QUEUE) == 0
+    assert frontier.given_up(QUEUE) == 2
+    # Nothing is left to do, even though nothing got done
+    assert frontier.finished(QUEUE)
+    frontier.close()
+
+
+def test_drain_retries_failed_tasks_across_workers(tmp_path):
+    frontier = Frontier(str(tmp_path / "frontier.sqlite3"), max_attempts=3)
+    frontier.add(QUEUE, [(str(index), index) for index in range(20)] + [("broken", -1)])
+    handled = []
+    failures = {}
+    lock = threading.Lock()
+
+    def handle(key, payload):
+        with lock:
+            # Every third task fails once, "broken" every time
+            if payload < 0 or (payload % 3 == 0 and key not in failures):
+                failures[key] = failures.get(key, 0) + 1
+                raise ValueError("fetch failed")
+            handled.append(payload)
+
+    threads = [threading.Thread(target=frontier.drain, args=(QUEUE, handle), kwargs={"poll_interval": 0.01})
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(handled) == list(range(20))
+    assert failures["broken"] == 3
+    assert frontier.given_up(QUEUE) == 1
+    assert frontier.finished(QUEUE)
+    frontier.close()
@@ -0,0 +1,19 @@
+import concurrent.futures
+import os
+
+from common.http_cache import HttpCache
+
+
+def test_concurrent_stores_of_one_url_each_write_a_whole_body(tmp_path):
+    cache = HttpCache(str(tmp_path / "cache"))
+    url = "https://www.nykaa.com/lipstick"
+    bodies = [bytes([index]) * 100000 for index in range(16)]
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda body: cache.store(url, body, {"ETag": '"v1"'}), bodies * 4))
+
+    assert cache.conditional_headers(url) == {"If-None-Match": '"v1"'}
+    assert cache.revalidated(url) in bodies
+    # No temp files are left behind
+    assert os.listdir(tmp_path / "cache" / "bodies") == [HttpCache._key(url)]
+    cache.close()
@@ -0,0 +1,12 @@
+import parse_stage
+
+
+def test_detail_page_with_a_rating_but_no_description_is_ready():
+    markup = '<html><body><div class="css-m6n3ou">4.1/5</div><div class="css-1hvvm95">87 ratings</div></body></html>'
+
+    details, (parse_seconds, extract_seconds) = parse_stage.detail_records(markup)
+
+    assert details == {"rating": "4.1", "num_ratings": "87", "description": ""}
+    assert parse_seconds >= 0 and extract_seconds >= 0
+    # A page with none of the detail selectors still falls back to the browser
+    assert parse_stage.detail_records("<html><body></body></html>")[0] is None
@@ -0,0 +1,41 @@
+import asyncio
+
+from scrapy import Request
+from scrapy.dupefilters import RFPDupeFilter
+from scrapy.utils.test import get_crawler
+
+from scrapper_scrapy.middlewares import BloomAwareDupeFilter, BloomDupeFilterMiddleware
+from scrapper_scrapy.spiders.zepto import ZeptoSpider
+
+
+def _middleware():
+    crawler = get_crawler(ZeptoSpider, {"BLOOMFILTER_ENABLED": True})
+    crawler.spider = crawler._create_spider()
+    return crawler, BloomDupeFilterMiddleware.from_crawler(crawler)
+
+
+def test_async_spider_output_drops_repeated_requests():
+    crawler, middleware = _middleware()
+    outputs = [Request("https://zeptonow.com/a"), Request("https://zeptonow.com/a"),
+               Request("https://zeptonow.com/a", dont_filter=True), {"item": 1}]
+
+    async def result():
+        for output in outputs:
+            yield output
+
+    async def collect():
+        return [r async for r in middleware.process_spider_output_async(None, result(), crawler.spider)]
+
+    kept = asyncio.run(collect())
+    assert kept == [outputs[0], outputs[2], outputs[3]]
+    assert crawler.stats.get_value("bloomfilter/filtered") == 1
+
+
+def test_scheduler_dedup_only_steps_aside_for_the_bloom_filter():
+    enabled = BloomAwareDupeFilter.from_crawler(get_crawler(settings_dict={"BLOOMFILTER_ENABLED": True}))
+    disabled = BloomAwareDupeFilter.from_crawler(get_crawler(settings_dict={"BLOOMFILTER_ENABLED": False}))
+
+    request = Request("https://zeptonow.com/a")
+    assert not enabled.request_seen(request) and not enabled.request_seen(request)
+    assert isinstance(disabled, RFPDupeFilter)
+    assert not disabled.request_seen(request) and disabled.request_seen(request)
@@ -0,0 +1,47 @@
+from scrapy.http import HtmlResponse, Request
+
+from conftest import fixture_path
+from scrapper_scrapy.items import NykaaProductItem
+from scrapper_scrapy.spiders.nykaa import NykaaSpider
+
+BASE_URL = "https://www.nykaa.com"
+
+
+def _response(name, url):
+    with open(fixture_path(name), "rb") as f:
+        return HtmlResponse(url=url, body=f.read(), encoding="utf-8", request=Request(url))
+
+
+def test_nykaa_parse_follows_every_product_type():
+    requests = list(NykaaSpider().parse(_response("nykaa_home.html", BASE_URL + "/")))
+
+    assert requests
+    assert all(request.callback.__name__ == "parse_listing" for request in requests)
+    assert all("/c/" in request.url for request in requests)
+    first = requests[0].cb_kwargs
+    assert first["category"] and first["subcategory"] and first["product_type"]
+
+
+def test_nykaa_parse_listing_requests_each_detail_page():
+    spider = NykaaSpider()
+    response = _response("nykaa_listing.html", BASE_URL + "/makeup/face/foundation/c/202")
+    results = list(spider.parse_listing(response, "Makeup", "Face", "Foundation"))
+
+    assert len(results) == 20
+    for request in results:
+        item = request.cb_kwargs["item"]
+        assert request.dont_filter
+        assert request.callback.__name__ == "parse_detail"
+        assert (item["category"], item["subcategory"], item["product_type"]) == ("Makeup", "Face", "Foundation")
+        assert item["product_name"] and item["price"]
+        assert item["brand"] == item["product_name"].split()[0]
+
+
+def test_nykaa_parse_detail_completes_the_item():
+    item = NykaaProductItem(product_name="Lakme Foundation", rating="", num_ratings="", description="")
+    response = _response("nykaa_product.html", BASE_URL + "/lakme-foundation/p/1001")
+    (result,) = NykaaSpider().parse_detail(response, item)
+
+    assert result["rating"] and "/5" not in result["rating"]
+    assert result["num_ratings"] and " " not in result["num_ratings"]
+    assert result["description"]
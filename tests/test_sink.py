@@ -0,0 +1,65 @@
+import csv
+
+import pytest
+
+from sink import RowSink
+
+HEADER = ["Category", "Product Name", "Price"]
+
+
+def read_rows(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+def test_rows_are_on_disk_before_their_callback_runs(tmp_path):
+    path = str(tmp_path / "products.csv")
+    sink = RowSink(path, HEADER, batch_size=3, flush_interval=60)
+    seen_on_flush = []
+
+    for index in range(5):
+        rows = [["makeup", f"Lipstick {index} {shade}", "499"] for shade in ("red", "pink")]
+        sink.write_rows(rows, on_flushed=lambda index=index: seen_on_flush.append((index, len(read_rows(path)))))
+    sink.close()
+
+    rows = read_rows(path)
+    assert rows[0] == HEADER
+    # Each call's rows stay together and in order
+    assert [row[1] for row in rows[1:]] == [f"Lipstick {i} {shade}" for i in range(5) for shade in ("red", "pink")]
+    assert sink.rows_written == 10
+    for index, rows_on_disk in seen_on_flush:
+        assert rows_on_disk >= 1 + 2 * (index + 1)
+    assert [index for index, _ in seen_on_flush] == list(range(5))
+
+
+def test_append_resumes_an_existing_file_without_a_second_header(tmp_path):
+    path = str(tmp_path / "products.csv")
+    sink = RowSink(path, HEADER)
+    sink.write_row(["makeup", "Kajal", "199"])
+    sink.close()
+
+    sink = RowSink(path, HEADER, append=True)
+    sink.write_row(["hair", "Shampoo", "299"])
+    sink.close()
+    assert read_rows(path) == [HEADER, ["makeup", "Kajal", "199"], ["hair", "Shampoo", "299"]]
+
+    # Without append the file starts over
+    sink = RowSink(path, HEADER)
+    sink.close()
+    assert read_rows(path) == [HEADER]
+
+
+def test_a_failed_write_is_raised_to_the_next_producer(tmp_path):
+    class Unwritable:
+        def __str__(self):
+            raise ValueError("not a cell")
+
+    sink = RowSink(str(tmp_path / "products.csv"), HEADER, batch_size=1)
+    flushed = []
+    sink.write_rows([["makeup", Unwritable(), "199"]], on_flushed=lambda: flushed.append(True))
+    sink.close()
+
+    # The rows' callback never runs, so nothing journals them as written
+    assert flushed == []
+    with pytest.raises(RuntimeError):
+        sink.write_row(["hair", "Shampoo", "299"])
@@ -1,107 +1,303 @@
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+import aiohttp
 import csv
+import os
+import sys
 import time
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import html_parser
+from common.frontier import Frontier, worker_id
+from common.http_cache import HttpCache
+from common.metrics import Metrics
+from specs import PRODUCT_CARD
 
 # Update with your actual base URL
 BASE_URL = 'https://zeptonow.com'
 # Update with the relative URL where categories are listed
 categories_page_url = urljoin(BASE_URL, '')
 
-# Step 1: Scrape the categories page
-response = requests.get(categories_page_url)
-if response.status_code != 200:
-    raise Exception(f"Failed to load categories page: {categories_page_url}")
-
-soup = BeautifulSoup(response.content, 'html.parser')
-
-# Locate the "Categories" header and then the associated <ul> list.
-categories_header = soup.find('h3', text="Categories")
-if not categories_header:
-    raise Exception("Categories header not found on the page.")
-
-categories_list = categories_header.find_next('ul')
-if not categories_list:
-    raise Exception("Categories list not found after the header.")
-
-# Extract each category and its relative link
-categories = []
-for li in categories_list.find_all('li'):
-    a_tag = li.find('a')
-    if a_tag:
-        # The category name is in the nested <p> tag
-        name_tag = a_tag.find('p')
-        category_name = name_tag.get_text(strip=True) if name_tag else "N/A"
-        category_link = a_tag.get('href')
-        # Ensure we have a full URL
-        full_category_link = urljoin(BASE_URL, category_link)
-        categories.append({
-            'category': category_name,
-            'categoryLink': full_category_link
-        })
-
-print(f"Found {len(categories)} categories.")
-
-# Step 2: For each category, crawl its page and extract product details.
-# The CSV will combine category details with product information.
-with open('products.csv', 'w', newline='', encoding='utf-8') as csvfile:
-    writer = csv.writer(csvfile, delimiter=',')
-    writer.writerow(['category', 'categoryLink', 'productName', 'productLink', 'price', 'quantity', 'offer'])
-    
-    for cat in categories:
+# Crawl tuning: how many category pages may be in flight at once, and the
+# politeness limit per host (steady requests/second plus allowed burst).
+CONCURRENCY = 8
+REQUESTS_PER_SECOND = 2.0
+BURST = 4
+REQUEST_TIMEOUT = 30
+# Conditional-GET cache so repeated crawls mostly transfer headers
+CACHE_DIR = 'http_cache'
+# HTML parser backend (html.parser, lxml or selectolax); defaults to SCRAPER_HTML_PARSER
+PARSER = None
+# Shared frontier database; set it on every node to split one crawl between them
+FRONTIER_FILE = None
+FRONTIER_QUEUE = 'zepto:categories'
+# Names the crawl in the frontier (None uses today's UTC date); nodes with the same id split one crawl
+CRAWL_ID = None
+# Prefix of the <prefix>.json/.prom stage timings written at the end (None disables it)
+METRICS_FILE = 'zepto_metrics'
+
+
+class TokenBucket:
+    """
+    Async token-bucket rate limiter. Tokens refill continuously at ``rate``
+    per second up to ``capacity``; each request consumes one.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class HostRateLimiter:
+    """
+    One TokenBucket per host, created on first use.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.buckets = {}
+
+    async def acquire(self, url):
+        host = urlparse(url).netloc
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(self.rate, self.capacity)
+        await self.buckets[host].acquire()
+
+
+async def fetch(session, limiter, url, cache=None, metrics=None, kind='page'):
+    """
+    Fetch a page, returning (status, body bytes) or (None, None) on network errors.
+    With a cache, the request is conditional and a 304 is served from disk as a 200.
+    With metrics, the rate-limit wait and the request are timed under ``kind``.
+    """
+    headers = cache.conditional_headers(url) if cache else {}
+    start = time.perf_counter()
+    await limiter.acquire(url)
+    if metrics:
+        acquired = time.perf_counter()
+        metrics.stage(kind, 'throttle').observe(acquired - start)
+    try:
+        async with session.get(url, headers=headers) as response:
+            status, content, response_headers = response.status, await response.read(), response.headers
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        print(f"Error fetching {url}: {e}")
+        if metrics:
+            metrics.pages(kind, 'failed').inc()
+        return None, None
+    if metrics:
+        metrics.stage(kind, 'fetch').observe(time.perf_counter() - acquired)
+        metrics.pages(kind, 'http' if status in (200, 304) else 'failed').inc()
+
+    if cache and status == 304:
+        content = cache.revalidated(url)
+        if content is None:
+            # Cached body vanished; fetch it again in full
+            return await fetch(session, limiter, url, metrics=metrics, kind=kind)
+        return 200, content
+    if cache and status == 200:
+        cache.store(url, content, response_headers)
+    return status, content
+
+
+def parse_categories(content, parser=PARSER, base_url=BASE_URL, metrics=None):
+    """Extract [{'category', 'categoryLink'}] from the categories page."""
+    start = time.perf_counter()
+    # find_next() needs a full BeautifulSoup tree, so selectolax isn't used for this one page
+    soup = html_parser.parse(content, None if parser == 'selectolax' else parser)
+    if metrics:
+        parsed = time.perf_counter()
+        metrics.stage('home', 'parse').observe(parsed - start)
+
+    # Locate the "Categories" header and then the associated <ul> list.
+    categories_header = soup.find('h3', text="Categories")
+    if not categories_header:
+        raise Exception("Categories header not found on the page.")
+
+    categories_list = categories_header.find_next('ul')
+    if not categories_list:
+        raise Exception("Categories list not found after the header.")
+
+    # Extract each category and its relative link
+    categories = []
+    for li in categories_list.find_all('li'):
+        a_tag = li.find('a')
+        if a_tag:
+            # The category name is in the nested <p> tag
+            name_tag = a_tag.find('p')
+            category_name = name_tag.get_text(strip=True) if name_tag else "N/A"
+            category_link = a_tag.get('href')
+            # Ensure we have a full URL
+            full_category_link = urljoin(base_url, category_link)
+            categories.append({
+                'category': category_name,
+                'categoryLink': full_category_link
+            })
+    if metrics:
+        metrics.stage('home', 'extract').observe(time.perf_counter() - parsed)
+    return categories
+
+
+def parse_products(cat, content, parser=PARSER, base_url=BASE_URL, metrics=None):
+    """Extract the CSV rows for every product card on a category page."""
+    start = time.perf_counter()
+    # Only build the product-card subtrees; nothing outside them is read
+    cat_soup = html_parser.parse(content, parser, html_parser.Only('a', {'data-testid': 'product-card'}))
+    if metrics:
+        parsed = time.perf_counter()
+        metrics.stage('category', 'parse').observe(parsed - start)
+    # Assume that each product is within an <a> tag with data-testid="product-card"
+    product_cards = cat_soup.find_all('a', attrs={'data-testid': 'product-card'})
+    if not product_cards:
+        print(f"No products found in category: {cat['category']}")
+        return []
+
+    rows = []
+    for product in PRODUCT_CARD.extract_all(product_cards):
+        # Get product link and ensure full URL
+        full_product_link = urljoin(base_url, product['productLink'])
+
+        rows.append([
+            cat['category'],
+            # cat['categoryLink'],
+            product['productName'],
+            # full_product_link,
+            product['price'],
+            product['quantity'],
+            product['offer']
+        ])
+        print(f"Scraped product: {product['productName']}")
+    if metrics:
+        metrics.stage('category', 'extract').observe(time.perf_counter() - parsed)
+    return rows
+
+
+async def scrape_category(session, limiter, semaphore, cat, cache=None, parser=PARSER, base_url=BASE_URL,
+                          metrics=None):
+    async with semaphore:
         print(f"Scraping category: {cat['category']}")
-        cat_response = requests.get(cat['categoryLink'])
-        if cat_response.status_code != 200:
-            print(f"Failed to load category page: {cat['categoryLink']}")
-            continue
+        status, content = await fetch(session, limiter, cat['categoryLink'], cache, metrics, 'category')
+    if status != 200:
+        print(f"Failed to load category page: {cat['categoryLink']}")
+        return []
+    return parse_products(cat, content, parser, base_url, metrics)
+
 
-        cat_soup = BeautifulSoup(cat_response.content, 'html.parser')
-        # Assume that each product is within an <a> tag with data-testid="product-card"
-        product_cards = cat_soup.find_all('a', attrs={'data-testid': 'product-card'})
-        if not product_cards:
-            print(f"No products found in category: {cat['category']}")
+async def extend_leases(frontier, queue, keys, worker):
+    """Keep renewing the leases on ``keys`` until cancelled."""
+    while True:
+        await asyncio.sleep(frontier.visibility_timeout / 3)
+        for key in keys:
+            frontier.extend(queue, key, worker)
+
+
+async def crawl_frontier(frontier, queue, scrape, batch_size, poll_interval=1.0):
+    """
+    Lease category tasks from the shared frontier in batches until no work
+    is left anywhere, acking each category once it has been scraped. Leases
+    are renewed while their batch is still being scraped.
+    """
+    worker = worker_id()
+    results = []
+    while True:
+        leased = frontier.lease(queue, worker, limit=batch_size)
+        if not leased:
+            if not frontier.outstanding(queue):
+                return results
+            # Other nodes still hold leases; wait in case one of them dies
+            await asyncio.sleep(poll_interval)
             continue
-        
-        for card in product_cards:
-            # Get product link and ensure full URL
-            product_link = card.get('href')
-            full_product_link = urljoin(BASE_URL, product_link)
-            
-            # Product Name: inside an element with data-testid="product-card-name"
-            name_tag = card.find(attrs={'data-testid': 'product-card-name'})
-            product_name = name_tag.get_text(strip=True) if name_tag else "N/A"
-            
-            # Price: inside element with data-testid="product-card-price"
-            price_tag = card.find(attrs={'data-testid': 'product-card-price'})
-            price = price_tag.get_text(strip=True) if price_tag else "N/A"
-            
-            # Quantity: typically within an element with data-testid="product-card-quantity"
-            quantity = "N/A"
-            quantity_tag = card.find(attrs={'data-testid': 'product-card-quantity'})
-            if quantity_tag:
-                h5_tag = quantity_tag.find('h5')
-                if h5_tag:
-                    quantity = h5_tag.get_text(strip=True)
-            
-            # Offer: try to locate an element that contains "Off" (e.g., "24% Off")
-            offer = "N/A"
-            discount_tag = card.find('p', string=lambda t: t and "Off" in t)
-            if discount_tag:
-                offer = discount_tag.get_text(strip=True)
-            
-            writer.writerow([
-                cat['category'], 
-                # cat['categoryLink'], 
-                product_name, 
-                # full_product_link, 
-                price, 
-                quantity, 
-                offer
-            ])
-            print(f"Scraped product: {product_name}")
-        
-        # Be polite and wait a bit between requests
-        time.sleep(1)
-
-print("CSV file 'products.csv' created successfully.")
+
+        heartbeat = asyncio.create_task(extend_leases(frontier, queue, [key for key, _ in leased], worker))
+        try:
+            batch = await asyncio.gather(*(scrape(cat) for _, cat in leased), return_exceptions=True)
+        finally:
+            heartbeat.cancel()
+        for (key, _), rows in zip(leased, batch):
+            if isinstance(rows, Exception):
+                print(f"Category {key} failed, releasing it: {rows}")
+                frontier.release(queue, key)
+            else:
+                frontier.ack(queue, key)
+                results.append(rows)
+
+
+async def main(concurrency=CONCURRENCY, requests_per_second=REQUESTS_PER_SECOND, burst=BURST, cache_dir=CACHE_DIR,
+               parser=PARSER, base_url=BASE_URL, start_url=categories_page_url, frontier_file=FRONTIER_FILE,
+               metrics_file=METRICS_FILE, crawl_id=CRAWL_ID):
+    # One keep-alive connection pool shared by every request; politeness
+    # comes from the per-host token bucket rather than fixed sleeps.
+    connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=concurrency, keepalive_timeout=60)
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+    limiter = HostRateLimiter(requests_per_second, burst)
+    semaphore = asyncio.Semaphore(concurrency)
+    cache = HttpCache(cache_dir) if cache_dir else None
+    metrics = Metrics(site='zepto')
+
+    frontier = None
+    if frontier_file:
+        frontier = Frontier(frontier_file)
+        queue = f"{FRONTIER_QUEUE}:{crawl_id or time.strftime('%Y-%m-%d', time.gmtime())}"
+        # A finished crawl has nothing left to hand out; don't overwrite its products.csv
+        if frontier.finished(queue):
+            frontier.close()
+            raise Exception(f"Crawl '{queue}' already finished in '{frontier_file}'; set a new CRAWL_ID to crawl again")
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        # Step 1: Scrape the categories page
+        status, content = await fetch(session, limiter, start_url, cache, metrics, 'home')
+        if status != 200:
+            raise Exception(f"Failed to load categories page: {start_url}")
+
+        categories = parse_categories(content, parser, base_url, metrics)
+        print(f"Found {len(categories)} categories.")
+
+        # Step 2: Crawl every category page concurrently and extract product details.
+        # The CSV will combine category details with product information.
+        def scrape(cat):
+            return scrape_category(session, limiter, semaphore, cat, cache, parser, base_url, metrics)
+
+        if frontier:
+            # Seeding is idempotent, so every node can do it; each node then
+            # writes the categories it leased to its own products.csv
+            frontier.add(queue, [(cat['categoryLink'], cat) for cat in categories])
+            results = await crawl_frontier(frontier, queue, scrape, concurrency)
+            frontier.close()
+        else:
+            results = await asyncio.gather(*(scrape(cat) for cat in categories))
+
+    if cache:
+        print(f"HTTP cache: {cache.hits} revalidated, {cache.misses} downloaded")
+        cache.close()
+
+    start = time.perf_counter()
+    with open('products.csv', 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.writer(csvfile, delimiter=',')
+        writer.writerow(['category', 'categoryLink', 'productName', 'productLink', 'price', 'quantity', 'offer'])
+        for rows in results:
+            writer.writerows(rows)
+            metrics.counter('scraper_rows_total').inc(len(rows))
+    metrics.stage('output', 'write').observe(time.perf_counter() - start)
+
+    print("CSV file 'products.csv' created successfully.")
+    if metrics_file:
+        metrics.export(metrics_file)
+        print(f"Metrics written to {metrics_file}.json and {metrics_file}.prom")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
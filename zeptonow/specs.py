@@ -0,0 +1,13 @@
+from common.extract_spec import Field, Spec
+
+# Selectors live here so they can change without touching the crawl code.
+
+# One <a data-testid="product-card"> on a category page
+PRODUCT_CARD = Spec({
+    "productLink": Field(attr="href", default=None),
+    "productName": Field('[data-testid="product-card-name"]', text="strip", default="N/A"),
+    "price": Field('[data-testid="product-card-price"]', text="strip", default="N/A"),
+    "quantity": Field('[data-testid="product-card-quantity"] h5', text="strip", default="N/A"),
+    # e.g. "24% Off"; CSS can't match on text, so this one uses find()
+    "offer": Field(find={"name": "p", "string": lambda t: t and "Off" in t}, text="strip", default="N/A"),
+})